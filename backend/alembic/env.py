@@ -18,14 +18,17 @@ if not current_sqlalchemy_url:
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# Skipped when the app passes its own connection, to keep the app's logging.
+if config.config_file_name is not None and "connection" not in config.attributes:
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.accounts.models import Account, AccountProfile  # noqa
 from app.organizations.models import Organization  # noqa
+from app.outbox.models import EmailOutbox  # noqa
 from app.projects.models import Project  # noqa
+from app.tiles.models import DatasetVersion  # noqa
 
 # from app.api_keys.models import APIKey  # noqa
 
@@ -86,6 +89,12 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # Reuse the connection handed over by app.core.migrations when present
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -93,14 +102,18 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-            include_object=include_object,
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+        do_run_migrations(connection)
+
+
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
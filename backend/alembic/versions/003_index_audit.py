@@ -0,0 +1,52 @@
+"""index_audit
+
+Drop indexes that duplicate primary keys or are never used by the service
+layer, and look emails up through a unique index on lower(email).
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 11:40:02.173904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicates of the primary keys
+    op.drop_index('ix_account_id', table_name='account')
+    op.drop_index('ix_account_profile_id', table_name='account_profile')
+    op.drop_index('ix_organization_id', table_name='organization')
+    op.drop_index('ix_project_id', table_name='project')
+
+    # Never used: name lookups always go through the (owner, name) unique constraints
+    op.drop_index('ix_organization_name', table_name='organization')
+    op.drop_index('ix_project_name', table_name='project')
+
+    # Emails are unique case-insensitively; fails loudly on existing case-only duplicates
+    op.execute("UPDATE account SET email = lower(email) WHERE email <> lower(email)")
+    op.drop_index('ix_account_email', table_name='account')
+    op.create_index('ix_account_email_lower', 'account', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_account_email_lower', table_name='account')
+    op.create_index('ix_account_email', 'account', ['email'], unique=True)
+    op.create_index('ix_project_name', 'project', ['name'], unique=False)
+    op.create_index('ix_organization_name', 'organization', ['name'], unique=False)
+    op.create_index('ix_project_id', 'project', ['id'], unique=False)
+    op.create_index('ix_organization_id', 'organization', ['id'], unique=False)
+    op.create_index('ix_account_profile_id', 'account_profile', ['id'], unique=False)
+    op.create_index('ix_account_id', 'account', ['id'], unique=False)
@@ -0,0 +1,36 @@
+"""dataset_version
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 16:41:05.918227
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('dataset_version',
+    sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('dataset_uid', sa.Uuid(), nullable=False),
+    sa.Column('relation', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('primary_key_column', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('dataset_uid')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dataset_version')
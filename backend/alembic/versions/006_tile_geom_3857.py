@@ -0,0 +1,168 @@
+"""tile_geom_3857
+
+Render tiles from a stored, GIST-indexed EPSG:3857 geometry column when the
+dataset table has one (see app.tiles.ingest), instead of reprojecting every
+row of the table. PostgreSQL only.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 18:02:47.530114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+GET_DATASET_TILE = r"""
+CREATE OR REPLACE FUNCTION public.get_dataset_tile(
+    relation text,
+    primary_key_column text,
+    z integer,
+    x integer,
+    y integer
+) RETURNS bytea
+LANGUAGE plpgsql
+STABLE PARALLEL SAFE
+AS $$
+DECLARE
+    rel regclass := to_regclass(quote_ident(relation));
+    properties text;
+    tile bytea;
+BEGIN
+    IF rel IS NULL THEN
+        RAISE EXCEPTION 'relation "%" does not exist', relation
+            USING ERRCODE = 'undefined_table';
+    END IF;
+
+    -- Every non-geometry column becomes a property; the feature id is "id"
+    SELECT coalesce(string_agg(format(', t.%I', attname), '' ORDER BY attnum), '')
+    INTO properties
+    FROM pg_attribute
+    WHERE attrelid = rel
+      AND attnum > 0
+      AND NOT attisdropped
+      AND attname <> 'id'
+      AND atttypid <> 'geometry'::regtype;
+
+    IF EXISTS (
+        SELECT 1 FROM pg_attribute
+        WHERE attrelid = rel AND attname = 'geom_3857' AND NOT attisdropped
+    ) THEN
+        -- Prepared by app.tiles.ingest: GIST-indexed, stored in EPSG:3857
+        EXECUTE format(
+            $f$
+            WITH mvtgeom AS (
+                SELECT ST_AsMVTGeom(
+                           t.geom_3857, ST_TileEnvelope($1, $2, $3), 4096, 0, true
+                       ) AS geom
+                      ,t.%I AS id%s
+                FROM %s t
+                WHERE t.geom_3857 && ST_TileEnvelope($1, $2, $3)
+            )
+            SELECT ST_AsMVT(mvtgeom, 'dataset', 4096, 'geom', 'id') FROM mvtgeom
+            $f$,
+            primary_key_column, properties, rel
+        ) INTO tile USING z, x, y;
+    ELSE
+        -- Not prepared yet: filter in EPSG:4326 so an index on geom still
+        -- applies, then reproject the candidates
+        EXECUTE format(
+            $f$
+            WITH mvtgeom AS (
+                SELECT ST_AsMVTGeom(
+                           ST_Transform(t.geom, 3857),
+                           ST_TileEnvelope($1, $2, $3),
+                           4096,
+                           0,
+                           true
+                       ) AS geom
+                      ,t.%I AS id%s
+                FROM %s t
+                WHERE t.geom && ST_Transform(ST_TileEnvelope($1, $2, $3), 4326)
+            )
+            SELECT ST_AsMVT(mvtgeom, 'dataset', 4096, 'geom', 'id') FROM mvtgeom
+            $f$,
+            primary_key_column, properties, rel
+        ) INTO tile USING z, x, y;
+    END IF;
+
+    IF tile IS NULL OR length(tile) = 0 THEN
+        RETURN NULL;
+    END IF;
+
+    RETURN tile;
+END;
+$$;
+"""
+
+GET_DATASET_TILE_TRANSFORM_ALL = r"""
+CREATE OR REPLACE FUNCTION public.get_dataset_tile(
+    relation text,
+    primary_key_column text,
+    z integer,
+    x integer,
+    y integer
+) RETURNS bytea
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    tile bytea;
+BEGIN
+    EXECUTE format(
+        $f$
+        WITH mvtgeom AS (
+            SELECT ST_AsMVTGeom(
+                       ST_Transform(geom, 3857),
+                       ST_TileEnvelope(%s, %s, %s),
+                       4096,
+                       0,
+                       true
+                   ) AS geom
+            ,%s AS id
+            ,*
+            FROM %s
+            WHERE ST_Intersects(
+                ST_Transform(geom, 3857),
+                ST_TileEnvelope(%s, %s, %s)
+            )
+        )
+        SELECT ST_AsMVT(mvtgeom, 'dataset', 4096, 'geom', 'id') FROM mvtgeom
+        $f$,
+        z, x, y,
+        primary_key_column,
+        quote_ident(relation),  -- Properly quote table name
+        z, x, y
+    ) INTO tile;
+
+    IF tile IS NULL OR length(tile) = 0 THEN
+        RETURN NULL;
+    END IF;
+
+    RETURN tile;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(GET_DATASET_TILE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(GET_DATASET_TILE_TRANSFORM_ALL)
@@ -0,0 +1,212 @@
+"""tile_zoom_pyramid
+
+Render tiles at zoom 0-6 from the simplified <relation>__z<max zoom> levels
+built by app.tiles.ingest when they exist. PostgreSQL only.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 19:24:11.806352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+GET_DATASET_TILE = r"""
+CREATE OR REPLACE FUNCTION public.get_dataset_tile(
+    relation text,
+    primary_key_column text,
+    z integer,
+    x integer,
+    y integer
+) RETURNS bytea
+LANGUAGE plpgsql
+STABLE PARALLEL SAFE
+AS $$
+DECLARE
+    rel regclass := to_regclass(quote_ident(relation));
+    max_zoom integer;
+    properties text;
+    tile bytea;
+BEGIN
+    IF rel IS NULL THEN
+        RAISE EXCEPTION 'relation "%" does not exist', relation
+            USING ERRCODE = 'undefined_table';
+    END IF;
+
+    -- Low zooms read the simplified level built by app.tiles.ingest, if any
+    FOREACH max_zoom IN ARRAY ARRAY[2, 4, 6] LOOP
+        IF z <= max_zoom THEN
+            rel := coalesce(
+                to_regclass(quote_ident(relation || '__z' || max_zoom)), rel
+            );
+            EXIT;
+        END IF;
+    END LOOP;
+
+    -- Every non-geometry column becomes a property; the feature id is "id"
+    SELECT coalesce(string_agg(format(', t.%I', attname), '' ORDER BY attnum), '')
+    INTO properties
+    FROM pg_attribute
+    WHERE attrelid = rel
+      AND attnum > 0
+      AND NOT attisdropped
+      AND attname <> 'id'
+      AND atttypid <> 'geometry'::regtype;
+
+    IF EXISTS (
+        SELECT 1 FROM pg_attribute
+        WHERE attrelid = rel AND attname = 'geom_3857' AND NOT attisdropped
+    ) THEN
+        -- Prepared by app.tiles.ingest: GIST-indexed, stored in EPSG:3857
+        EXECUTE format(
+            $f$
+            WITH mvtgeom AS (
+                SELECT ST_AsMVTGeom(
+                           t.geom_3857, ST_TileEnvelope($1, $2, $3), 4096, 0, true
+                       ) AS geom
+                      ,t.%I AS id%s
+                FROM %s t
+                WHERE t.geom_3857 && ST_TileEnvelope($1, $2, $3)
+            )
+            SELECT ST_AsMVT(mvtgeom, 'dataset', 4096, 'geom', 'id') FROM mvtgeom
+            $f$,
+            primary_key_column, properties, rel
+        ) INTO tile USING z, x, y;
+    ELSE
+        -- Not prepared yet: filter in EPSG:4326 so an index on geom still
+        -- applies, then reproject the candidates
+        EXECUTE format(
+            $f$
+            WITH mvtgeom AS (
+                SELECT ST_AsMVTGeom(
+                           ST_Transform(t.geom, 3857),
+                           ST_TileEnvelope($1, $2, $3),
+                           4096,
+                           0,
+                           true
+                       ) AS geom
+                      ,t.%I AS id%s
+                FROM %s t
+                WHERE t.geom && ST_Transform(ST_TileEnvelope($1, $2, $3), 4326)
+            )
+            SELECT ST_AsMVT(mvtgeom, 'dataset', 4096, 'geom', 'id') FROM mvtgeom
+            $f$,
+            primary_key_column, properties, rel
+        ) INTO tile USING z, x, y;
+    END IF;
+
+    IF tile IS NULL OR length(tile) = 0 THEN
+        RETURN NULL;
+    END IF;
+
+    RETURN tile;
+END;
+$$;
+"""
+
+GET_DATASET_TILE_FULL_RESOLUTION = r"""
+CREATE OR REPLACE FUNCTION public.get_dataset_tile(
+    relation text,
+    primary_key_column text,
+    z integer,
+    x integer,
+    y integer
+) RETURNS bytea
+LANGUAGE plpgsql
+STABLE PARALLEL SAFE
+AS $$
+DECLARE
+    rel regclass := to_regclass(quote_ident(relation));
+    properties text;
+    tile bytea;
+BEGIN
+    IF rel IS NULL THEN
+        RAISE EXCEPTION 'relation "%" does not exist', relation
+            USING ERRCODE = 'undefined_table';
+    END IF;
+
+    -- Every non-geometry column becomes a property; the feature id is "id"
+    SELECT coalesce(string_agg(format(', t.%I', attname), '' ORDER BY attnum), '')
+    INTO properties
+    FROM pg_attribute
+    WHERE attrelid = rel
+      AND attnum > 0
+      AND NOT attisdropped
+      AND attname <> 'id'
+      AND atttypid <> 'geometry'::regtype;
+
+    IF EXISTS (
+        SELECT 1 FROM pg_attribute
+        WHERE attrelid = rel AND attname = 'geom_3857' AND NOT attisdropped
+    ) THEN
+        -- Prepared by app.tiles.ingest: GIST-indexed, stored in EPSG:3857
+        EXECUTE format(
+            $f$
+            WITH mvtgeom AS (
+                SELECT ST_AsMVTGeom(
+                           t.geom_3857, ST_TileEnvelope($1, $2, $3), 4096, 0, true
+                       ) AS geom
+                      ,t.%I AS id%s
+                FROM %s t
+                WHERE t.geom_3857 && ST_TileEnvelope($1, $2, $3)
+            )
+            SELECT ST_AsMVT(mvtgeom, 'dataset', 4096, 'geom', 'id') FROM mvtgeom
+            $f$,
+            primary_key_column, properties, rel
+        ) INTO tile USING z, x, y;
+    ELSE
+        -- Not prepared yet: filter in EPSG:4326 so an index on geom still
+        -- applies, then reproject the candidates
+        EXECUTE format(
+            $f$
+            WITH mvtgeom AS (
+                SELECT ST_AsMVTGeom(
+                           ST_Transform(t.geom, 3857),
+                           ST_TileEnvelope($1, $2, $3),
+                           4096,
+                           0,
+                           true
+                       ) AS geom
+                      ,t.%I AS id%s
+                FROM %s t
+                WHERE t.geom && ST_Transform(ST_TileEnvelope($1, $2, $3), 4326)
+            )
+            SELECT ST_AsMVT(mvtgeom, 'dataset', 4096, 'geom', 'id') FROM mvtgeom
+            $f$,
+            primary_key_column, properties, rel
+        ) INTO tile USING z, x, y;
+    END IF;
+
+    IF tile IS NULL OR length(tile) = 0 THEN
+        RETURN NULL;
+    END IF;
+
+    RETURN tile;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(GET_DATASET_TILE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(GET_DATASET_TILE_FULL_RESOLUTION)
@@ -0,0 +1,37 @@
+"""dataset_owner
+
+Record the account that owns each dataset, so tiles are only served to it.
+Existing datasets have no owner and are served to admins only until they are
+registered again with one.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 21:06:38.512907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('dataset_version', sa.Column('account_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_dataset_version_account_id'), 'dataset_version', ['account_id'], unique=False)
+    op.create_foreign_key('dataset_version_account_id_fkey', 'dataset_version', 'account', ['account_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('dataset_version_account_id_fkey', 'dataset_version', type_='foreignkey')
+    op.drop_index(op.f('ix_dataset_version_account_id'), table_name='dataset_version')
+    op.drop_column('dataset_version', 'account_id')
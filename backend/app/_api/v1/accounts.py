@@ -1,18 +1,23 @@
 from datetime import timedelta
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Form,
+    Header,
+    HTTPException,
+    Query,
+    status,
+)
+from fastapi.responses import Response
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.accounts.emails import (
-    send_password_reset_email,
-    send_password_reset_succeed_email,
-    send_welcome_email,
-)
 from app.accounts.models import (
-    Account,
     AccountCreate,
+    AccountPage,
+    AccountPrincipal,
     AccountProfileMe,
     AccountType,
     AccountUpdate,
@@ -21,7 +26,10 @@ from app.accounts.services import (
     create_account,
     get_account,
     get_account_by_email,
-    get_account_profile,
+    get_account_profile_etag,
+    get_account_profile_json,
+    get_accounts,
+    stream_accounts,
     update_account,
 )
 from app.auth.models import Token, TokenRefresh
@@ -31,16 +39,25 @@ from app.auth.services.jwt import (
     get_refresh_token,
     refresh_access_token,
 )
-from app.auth.services.security import verify_password
+from app.auth.services.security import verify_password_async
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.exceptions import (
     AccountDisabledException,
     EmailAlreadyExistsException,
     InvalidLoginCredentialsException,
+    PasswordHashingUnavailableException,
 )
 from app.core.logging import get_logger, setup_logging
-from app.dependencies import get_current_active_account
+from app.core.responses import etag_matches, model_response, not_modified
+from app.core.serialization import StreamFormat, json_streaming_response
+from app.dependencies import (
+    get_current_active_account,
+    get_current_admin_account,
+    get_locale,
+)
+from app.outbox.models import EmailKind
+from app.outbox.services import enqueue_email
 
 setup_logging()
 logger = get_logger(__name__)
@@ -51,17 +68,16 @@ router = APIRouter(prefix="/api/v1/accounts", tags=["Account"])
 @router.post("/signup", status_code=status.HTTP_201_CREATED, response_model=Token)
 async def signup(
     account: Annotated[AccountCreate, Form()],
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
+    locale: str = Depends(get_locale),
 ):
 
     if not account.email or not account.password:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
     try:
-        account = await create_account(db=db, account=account)
+        # Also enqueues the welcome email
+        account = await create_account(db=db, account=account, locale=locale)
         if account:
-            background_tasks.add_task(send_welcome_email, account.email)
-
             # Issue JWT access + refresh tokens
             data = {"sub": account.email.lower(), "id": account.id}
             access_token_expires = timedelta(
@@ -77,8 +93,8 @@ async def signup(
                 refresh_token=refresh_token,
                 token_type="bearer",
             )
-    except EmailAlreadyExistsException:
-        raise EmailAlreadyExistsException
+    except (EmailAlreadyExistsException, PasswordHashingUnavailableException):
+        raise
     except Exception as e:
         logger.debug(e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -86,7 +102,7 @@ async def signup(
 
 @router.post("/login", response_model=Token)
 async def login(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
 ):
 
     # Lookup user by email in database
@@ -96,7 +112,7 @@ async def login(
         raise InvalidLoginCredentialsException
 
     # Verify password using hashing
-    if not verify_password(form_data.password, account.hashed_password):
+    if not await verify_password_async(form_data.password, account.hashed_password):
         logger.debug("not verify_password")
         raise InvalidLoginCredentialsException
 
@@ -119,19 +135,32 @@ async def login(
 
 
 @router.get(
-    "/profile/me", status_code=status.HTTP_200_OK, response_model=AccountProfileMe
+    "/profile/me",
+    status_code=status.HTTP_200_OK,
+    response_model=AccountProfileMe,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}},
 )
 async def get_self_account_profile(
-    db: Session = Depends(get_db),
-    current_account: Account = Depends(get_current_active_account),
+    db: AsyncSession = Depends(get_db),
+    current_account: AccountPrincipal = Depends(get_current_active_account),
+    if_none_match: Optional[str] = Header(default=None),
 ):
-    return await get_account_profile(db=db, account_id=current_account.id)
+    etag = await get_account_profile_etag(db=db, account_id=current_account.id)
+    # Cacheable by the browser only, and always revalidated
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return not_modified(headers)
+
+    body = await get_account_profile_json(
+        db=db, account_id=current_account.id, etag=etag
+    )
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @router.patch("/profile/me", status_code=status.HTTP_200_OK)
 async def update_account_profile(
-    db: Session = Depends(get_db),
-    current_account: Account = Depends(get_current_active_account),
+    db: AsyncSession = Depends(get_db),
+    current_account: AccountPrincipal = Depends(get_current_active_account),
 ):
     return await get_account(db=db, account_id=current_account.id)
 
@@ -146,46 +175,42 @@ async def refresh_token(refresh_token: str = Depends(get_refresh_token)):
 @router.post("/reset-password", status_code=status.HTTP_201_CREATED)
 async def create_password_reset(
     email: Annotated[str, Form()],
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
+    locale: str = Depends(get_locale),
 ):
     account = await get_account_by_email(db=db, email=email)
     if not account:
         return
 
-    # Issue JWT access tokens as reset token with a small time window
-    data = {"sub": account.email.lower(), "id": account.id}
-    password_reset_token_expires = timedelta(
-        minutes=settings.RESET_TOKEN_EXPIRY_MINUTES
-    )
-    password_reset_token = create_access_token(
-        data=data, expires_delta=password_reset_token_expires
-    )
-    logger.debug(f"password_reset_token={password_reset_token}")
-    background_tasks.add_task(
-        send_password_reset_email,
+    # The worker mints the reset token when sending
+    enqueue_email(
+        db,
+        EmailKind.PASSWORD_RESET,
         account.email,
-        password_reset_token=password_reset_token,
+        account_id=account.id,
+        locale=locale,
     )
+    await db.commit()
 
 
 @router.post("/confirm-reset-password", status_code=status.HTTP_200_OK)
 async def confirm_password_reset(
     password: Annotated[str, Form()],
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-    account: Account = Depends(get_current_active_account),
+    db: AsyncSession = Depends(get_db),
+    account: AccountPrincipal = Depends(get_current_active_account),
+    locale: str = Depends(get_locale),
 ):
-    if not account.email or not account.hashed_password:
+    if not account.email or not account.has_password:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
     try:
-
+        # Pending in the session, so update_account commits it with the new password
+        enqueue_email(
+            db, EmailKind.PASSWORD_RESET_SUCCEED, account.email, locale=locale
+        )
         account = await update_account(
             db=db, account=AccountUpdate(id=account.id, password=password)
         )
         if account:
-            background_tasks.add_task(send_password_reset_succeed_email, account.email)
-
             # Issue JWT access + refresh tokens
             data = {"sub": account.email.lower(), "id": account.id}
             access_token_expires = timedelta(
@@ -201,6 +226,48 @@ async def confirm_password_reset(
                 refresh_token=refresh_token,
                 token_type="bearer",
             )
+    except PasswordHashingUnavailableException:
+        raise
     except Exception as e:
         logger.debug(e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    response_model=AccountPage,
+    dependencies=[Depends(get_current_admin_account)],
+)
+async def list_accounts(
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    account_type: Optional[AccountType] = None,
+    disabled: Optional[bool] = None,
+):
+    page = await get_accounts(
+        db=db,
+        limit=limit,
+        cursor=cursor,
+        account_type=account_type,
+        disabled=disabled,
+    )
+    return model_response(AccountPage, page)
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_current_admin_account)],
+)
+async def export_accounts(
+    account_type: Optional[AccountType] = None,
+    disabled: Optional[bool] = None,
+    format: StreamFormat = "json",
+):
+    return json_streaming_response(
+        stream_accounts(account_type=account_type, disabled=disabled),
+        format=format,
+        filename="accounts",
+    )
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, status
+
+from app.accounts.services import (
+    account_principal_cache,
+    account_profile_cache,
+    account_profile_loads,
+)
+from app.auth.services.jwt import token_cache
+from app.auth.services.security import hashing_stats
+from app.core.compression import get_compression_metrics
+from app.core.database import get_database_pool_status
+from app.core.instrumentation import get_operation_metrics
+from app.core.mail import get_smtp_pool_stats
+from app.dependencies import get_current_admin_account
+from app.tiles.services import tile_cache, tile_renders, tile_stats
+
+# Statement text and pool internals: admins only, even where enabled
+router = APIRouter(
+    prefix="/api/v1/debug",
+    tags=["Debug"],
+    dependencies=[Depends(get_current_admin_account)],
+)
+
+
+@router.get("/db-pool", status_code=status.HTTP_200_OK)
+async def get_db_pool_status():
+    return get_database_pool_status()
+
+
+@router.get("/metrics", status_code=status.HTTP_200_OK)
+async def get_metrics():
+    return {
+        "db_pool": get_database_pool_status(),
+        "token_cache": token_cache.stats(),
+        "account_principal_cache": account_principal_cache.stats(),
+        "account_profile_cache": {
+            **account_profile_cache.stats(),
+            **account_profile_loads.stats(),
+        },
+        "password_hashing": hashing_stats.as_dict(),
+        "sql": get_operation_metrics(),
+        "smtp": get_smtp_pool_stats(),
+        "compression": get_compression_metrics(),
+        "tiles": {
+            "memory": tile_cache.stats(),
+            **tile_renders.stats(),
+            **tile_stats.as_dict(),
+        },
+    }
@@ -0,0 +1,71 @@
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Path, status
+from fastapi.responses import Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.accounts.models import AccountPrincipal
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.exceptions import (
+    DatasetNotFoundException,
+    InvalidTileCoordinatesException,
+)
+from app.core.logging import get_logger, setup_logging
+from app.core.responses import etag_matches, not_modified
+from app.dependencies import get_current_active_account, is_admin_account
+from app.tiles.services import (
+    MVT_MEDIA_TYPE,
+    get_tile_data,
+    get_tile_etag,
+    get_tile_source,
+)
+
+setup_logging()
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/api/v1/tiles", tags=["Tiles"])
+
+
+@router.get(
+    "/{dataset}/{z}/{x}/{y}.mvt",
+    status_code=status.HTTP_200_OK,
+    response_class=Response,
+    responses={
+        status.HTTP_200_OK: {"content": {MVT_MEDIA_TYPE: {}}},
+        status.HTTP_204_NO_CONTENT: {"description": "No features in this tile"},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"},
+    },
+)
+async def get_dataset_tile(
+    dataset: uuid.UUID,
+    z: int = Path(ge=0, le=24),
+    x: int = Path(ge=0),
+    y: int = Path(ge=0),
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+    current_account: AccountPrincipal = Depends(get_current_active_account),
+):
+    if x >= 1 << z or y >= 1 << z:
+        raise InvalidTileCoordinatesException
+
+    source = await get_tile_source(db=db, dataset_uid=dataset)
+    # Before the ETag and both caches, which hold tiles of every account.
+    # Datasets of other accounts are reported as missing.
+    if source.account_id != current_account.id and not is_admin_account(
+        current_account
+    ):
+        raise DatasetNotFoundException
+    etag = get_tile_etag(source, z, x, y)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.TILE_MAX_AGE_SECONDS}",
+    }
+    if etag_matches(if_none_match, etag):
+        return not_modified(headers)
+
+    data = await get_tile_data(db, source, z, x, y)
+    if not data:
+        return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+    return Response(data, media_type=MVT_MEDIA_TYPE, headers=headers)
@@ -1,90 +1,160 @@
+from datetime import timedelta
+
+from app.auth.services.jwt import create_access_token
 from app.core.config import settings
+from app.core.templates import email_templates
 from app.utils import send_email_smtp
 
-
-async def send_welcome_email(recipient: str):
-    subject = "Welcome!"
-    body = f"""<!DOCTYPE html>
+# Templates are compiled at import; $brand_name and $app_url are filled in then,
+# the other fields on every send.
+HTML_LAYOUT = """<!DOCTYPE html>
 <html>
 <head>
   <meta charset="UTF-8">
-  <title>Welcome Email</title>
+  <title>{title}</title>
 </head>
 <body style="font-family: Arial, sans-serif; background-color: #f9f9f9; padding: 30px;">
   <div style="max-width: 600px; margin: auto; background-color: #ffffff; border-radius: 8px;
   box-shadow: 0 2px 5px rgba(0,0,0,0.1); padding: 20px;">
-    <h2 style="color: #333;">Welcome to {settings.BRAND_NAME}!</h2>
+    <h2 style="color: #333;">{title}</h2>
     <p style="font-size: 16px; color: #555;">
-      We're excited to have you on board. Click below to start using the app:
-    </p>
-    <p>
-      <a href="{settings.APP_URL}" style="display: inline-block; background-color: #4CAF50;
-      color: white; padding: 12px 20px; text-decoration: none; border-radius: 5px; font-size: 16px;">
-        Go to App
-      </a>
-    </p>
+      {intro}
+    </p>{action}
     <p style="font-size: 14px; color: #3c3f3c;">
-      If you have any questions, feel free to reach out to our support team.
+      {support}
     </p>
   </div>
 </body>
 </html>
 """
-    await send_email_smtp(subject, body, recipient)
 
-
-async def send_password_reset_email(recipient: str, password_reset_token: str):
-    url = f"{settings.APP_URL}/reset-password?token={password_reset_token}"
-    subject = "Reset Password Requested!"
-    body = f"""<!DOCTYPE html>
-<html>
-<head>
-  <meta charset="UTF-8">
-  <title>Reset Password Requested!</title>
-</head>
-<body style="font-family: Arial, sans-serif; background-color: #f9f9f9; padding: 30px;">
-  <div style="max-width: 600px; margin: auto; background-color: #ffffff; border-radius: 8px;
-    box-shadow: 0 2px 5px rgba(0,0,0,0.1); padding: 20px;">
-    <h2 style="color: #333;">Reset Password Requested!</h2>
-    <p style="font-size: 16px; color: #555;">
-      We have received a password reset request for your account. Click below to reset your password:
-    </p>
+HTML_ACTION = """
     <p>
-      <a href="{url}" style="display: inline-block; background-color: #4CAF50; color: white;
-      padding: 12px 20px; text-decoration: none; border-radius: 5px; font-size: 16px;">
-        Reset password
+      <a href="{url}" style="display: inline-block; background-color: #4CAF50;
+      color: white; padding: 12px 20px; text-decoration: none; border-radius: 5px; font-size: 16px;">
+        {label}
       </a>
-    </p>
-    <p style="font-size: 14px; color: #3c3f3c;">
-      If you have any questions, feel free to reach out to our support team.
-    </p>
-  </div>
-</body>
-</html>
-"""
-    await send_email_smtp(subject, body, recipient)
+    </p>"""
 
+SUPPORT = {
+    "en": "If you have any questions, feel free to reach out to our support team.",
+    "id": "Jika ada pertanyaan, jangan ragu untuk menghubungi tim dukungan kami.",
+}
 
-async def send_password_reset_succeed_email(recipient: str):
-    subject = "Your password has been reset"
-    body = """<!DOCTYPE html>
-<html>
-<head>
-  <meta charset="UTF-8">
-  <title>Reset Password Successful!</title>
-</head>
-<body style="font-family: Arial, sans-serif; background-color: #f9f9f9; padding: 30px;">
-  <div style="max-width: 600px; margin: auto; background-color: #ffffff; border-radius: 8px;
-    box-shadow: 0 2px 5px rgba(0,0,0,0.1); padding: 20px;">
-    <h2 style="color: #333;">Reset Password Successful!</h2>
-    <p style="font-size: 16px; color: #555;">
-      Your password has been reset
-    </p>
-    <p style="font-size: 14px; color: #3c3f3c;">
-      If you have any questions, feel free to reach out to our support team.
-    </p>
-  </div>
-</body>
-</html>
-"""
-    await send_email_smtp(subject, body, recipient)
+
+def register_email(
+    name: str,
+    locale: str,
+    subject: str,
+    title: str,
+    intro: str,
+    action_url: str = "",
+    action_label: str = "",
+):
+    action_html = (
+        HTML_ACTION.format(url=action_url, label=action_label) if action_url else ""
+    )
+    action_text = f"{action_label}: {action_url}\n\n" if action_url else ""
+    email_templates.register(
+        name,
+        locale,
+        subject=subject,
+        text=f"{title}\n\n{intro}\n\n{action_text}{SUPPORT[locale]}\n",
+        html=HTML_LAYOUT.format(
+            title=title, intro=intro, action=action_html, support=SUPPORT[locale]
+        ),
+    )
+
+
+# ******** Welcome ************************************************************
+register_email(
+    "welcome",
+    "en",
+    subject="Welcome!",
+    title="Welcome to $brand_name!",
+    intro="We're excited to have you on board. Click below to start using the app:",
+    action_url="$app_url",
+    action_label="Go to App",
+)
+register_email(
+    "welcome",
+    "id",
+    subject="Selamat datang!",
+    title="Selamat datang di $brand_name!",
+    intro="Kami senang Anda bergabung. Klik di bawah untuk mulai menggunakan aplikasi:",
+    action_url="$app_url",
+    action_label="Buka Aplikasi",
+)
+
+# ******** Password reset *****************************************************
+register_email(
+    "password_reset",
+    "en",
+    subject="Reset Password Requested!",
+    title="Reset Password Requested!",
+    intro=(
+        "We have received a password reset request for your account. "
+        "Click below to reset your password:"
+    ),
+    action_url="$app_url/reset-password?token=$password_reset_token",
+    action_label="Reset password",
+)
+register_email(
+    "password_reset",
+    "id",
+    subject="Permintaan Reset Kata Sandi",
+    title="Permintaan Reset Kata Sandi",
+    intro=(
+        "Kami menerima permintaan reset kata sandi untuk akun Anda. "
+        "Klik di bawah untuk mengatur ulang kata sandi Anda:"
+    ),
+    action_url="$app_url/reset-password?token=$password_reset_token",
+    action_label="Reset kata sandi",
+)
+
+# ******** Password reset succeeded *******************************************
+register_email(
+    "password_reset_succeed",
+    "en",
+    subject="Your password has been reset",
+    title="Reset Password Successful!",
+    intro="Your password has been reset",
+)
+register_email(
+    "password_reset_succeed",
+    "id",
+    subject="Kata sandi Anda telah direset",
+    title="Reset Kata Sandi Berhasil!",
+    intro="Kata sandi Anda telah direset",
+)
+
+
+async def send_welcome_email(recipient: str, locale: str | None = None):
+    email = email_templates.render("welcome", locale)
+    await send_email_smtp(email.subject, email.html, recipient, text=email.text)
+
+
+async def send_password_reset_email(
+    recipient: str, password_reset_token: str, locale: str | None = None
+):
+    email = email_templates.render(
+        "password_reset", locale, password_reset_token=password_reset_token
+    )
+    await send_email_smtp(email.subject, email.html, recipient, text=email.text)
+
+
+async def send_password_reset_link(
+    recipient: str, account_id: int, locale: str | None = None
+):
+    """Mint the reset token when sending, so it is never stored in the outbox."""
+    # JWT access token as reset token, with a small time window
+    password_reset_token = create_access_token(
+        data={"sub": recipient.lower(), "id": account_id},
+        expires_delta=timedelta(minutes=settings.RESET_TOKEN_EXPIRY_MINUTES),
+    )
+    await send_password_reset_email(recipient, password_reset_token, locale)
+
+
+async def send_password_reset_succeed_email(recipient: str, locale: str | None = None):
+    email = email_templates.render("password_reset_succeed", locale)
+    await send_email_smtp(email.subject, email.html, recipient, text=email.text)
@@ -1,11 +1,13 @@
 import enum
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
 
 from pydantic import SecretStr, field_validator
-from sqlmodel import TIMESTAMP, Column, Enum, Field, Relationship, SQLModel
+from sqlmodel import TIMESTAMP, Column, Enum, Field, Index, Relationship, SQLModel, func
 
+from app.core.clock import utc_now
+from app.core.ids import uuid7
 from app.organizations.models import Organization, OrganizationPublic
 
 
@@ -15,7 +17,7 @@ class AccountType(enum.Enum):
 
 
 class AccountBase(SQLModel):
-    email: str = Field(unique=True, index=True)
+    email: str
     disabled: bool = False
     account_type: AccountType = Field(
         sa_column=Column(Enum(AccountType)), default=AccountType.USER
@@ -24,9 +26,13 @@ class AccountBase(SQLModel):
 
 class Account(AccountBase, table=True):
     __tablename__ = "account"
+    __table_args__ = (
+        # Keyset pagination order for the admin listing
+        Index(f"ix_{__tablename__}_created_at_id", "created_at", "id"),
+    )
 
-    id: Optional[int] = Field(default=None, primary_key=True, index=True)
-    uid: uuid.UUID = Field(default_factory=uuid.uuid4, unique=True, index=True)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    uid: uuid.UUID = Field(default_factory=uuid7, unique=True, index=True)
 
     hashed_password: Optional[str]
 
@@ -36,13 +42,18 @@ class Account(AccountBase, table=True):
     # The profile record of this account
     profile: Optional["AccountProfile"] = Relationship(back_populates="account")
 
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utc_now)
     updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(TIMESTAMP, onupdate=datetime.now(timezone.utc)),
+        default_factory=utc_now,
+        sa_column=Column(TIMESTAMP, onupdate=utc_now),
     )
 
 
+# Emails are unique case-insensitively and looked up through lower(email)
+ACCOUNT_EMAIL_INDEX = "ix_account_email_lower"
+Index(ACCOUNT_EMAIL_INDEX, func.lower(Account.email), unique=True)
+
+
 class AccountCreate(AccountBase):
     uid: Optional[uuid.UUID] = None
     full_name: str
@@ -68,6 +79,25 @@ class AccountPublic(AccountBase):
     pass
 
 
+class AccountListItem(AccountBase):
+    id: int
+    uid: uuid.UUID
+    created_at: datetime
+
+
+class AccountPage(SQLModel):
+    items: list[AccountListItem]
+    next_cursor: Optional[str] = None
+
+
+class AccountPrincipal(AccountBase):
+    """Cacheable identity of an authenticated account, without secrets."""
+
+    id: int
+    uid: uuid.UUID
+    has_password: bool = False
+
+
 class AccountUpdate(SQLModel):
     id: int
     email: Optional[str] = None
@@ -86,8 +116,8 @@ class AccountProfileBase(SQLModel):
 class AccountProfile(AccountProfileBase, table=True):
     __tablename__ = "account_profile"
 
-    id: Optional[int] = Field(default=None, primary_key=True, index=True)
-    uid: uuid.UUID = Field(default_factory=uuid.uuid4, unique=True, index=True)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    uid: uuid.UUID = Field(default_factory=uuid7, unique=True, index=True)
 
     # Relationship to Account
     account_id: Optional[int] = Field(
@@ -95,10 +125,10 @@ class AccountProfile(AccountProfileBase, table=True):
     )
     account: Optional["Account"] = Relationship(back_populates="profile")
 
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utc_now)
     updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(TIMESTAMP, onupdate=datetime.now(timezone.utc)),
+        default_factory=utc_now,
+        sa_column=Column(TIMESTAMP, onupdate=utc_now),
     )
 
 
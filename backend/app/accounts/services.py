@@ -1,114 +1,244 @@
-import uuid
-from typing import List, Optional
+import base64
+import binascii
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
 
 from fastapi import HTTPException
-from sqlmodel import Session, select
+from sqlalchemy import func, insert, literal, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload, selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.accounts.models import (
+    ACCOUNT_EMAIL_INDEX,
     Account,
     AccountCreate,
     AccountDelete,
+    AccountListItem,
+    AccountPage,
+    AccountPrincipal,
     AccountProfile,
     AccountProfileMe,
+    AccountType,
     AccountUpdate,
 )
-from app.auth.services.security import get_password_hash
+from app.auth.services.security import get_password_hash_async
+from app.core.cache import LRUCache, SingleFlight
+from app.core.clock import utc_now
+from app.core.config import settings
+from app.core.database import async_session_factory, get_violated_constraint
 from app.core.exceptions import (
     APINotImplementedError,
     EmailAlreadyExistsException,
+    InvalidCursorException,
 )
+from app.core.ids import generate_public_id, uuid7
 from app.core.logging import get_logger, setup_logging
+from app.core.responses import dump_model_json, make_etag
 from app.organizations.models import Organization
+from app.outbox.models import EmailKind
+from app.outbox.services import enqueue_email
 from app.projects.models import Project
 
 setup_logging()
 logger = get_logger(__name__)
 
+# Principals are cached under both ("id", account_id) and ("email", email).
+# Writes invalidate this worker's entries only. Other workers keep serving
+# the old principal, disabled flag included, until ACCOUNT_CACHE_TTL_SECONDS
+# runs out, so that setting is how long a disabled account may stay usable.
+account_principal_cache = LRUCache(
+    maxsize=settings.ACCOUNT_CACHE_MAXSIZE, ttl=settings.ACCOUNT_CACHE_TTL_SECONDS
+)
 
-async def create_account(db: Session, account: AccountCreate) -> Account:
-    logger.debug(f"Creating user account: {account.email}")
+# Serialized /profile/me bodies as account_id -> (etag, bytes). An entry is
+# only served while its ETag matches the database validator, so updates made
+# by other workers are never missed; local writes drop it right away.
+account_profile_cache = LRUCache(maxsize=settings.PROFILE_CACHE_MAXSIZE)
+account_profile_loads = SingleFlight()
 
-    with db.begin():
-        # Check if email already exists
-        existing_account = await get_account_by_email(db, account.email)
-        if existing_account:
-            raise EmailAlreadyExistsException
+# Bump when AccountProfileMe changes shape, so clients drop their copies
+PROFILE_ETAG_VERSION = 1
 
-        # Create the account
-        hashed_password = (
-            get_password_hash(account.password) if account.password else None
-        )
-        db_account = Account(
-            email=account.email.lower(),
-            hashed_password=hashed_password,
-            disabled=account.disabled,
-            account_type=account.account_type,
-            uid=account.uid if account.uid else uuid.uuid4(),
-        )
+# /profile/me is served in exactly three statements whatever the number of
+# organizations and projects: account+profile, organizations, projects.
+# Any other relationship access raises instead of silently lazy-loading (N+1).
+PROFILE_LOAD_OPTIONS = (
+    selectinload(Account.organizations)
+    .selectinload(Organization.projects)
+    .raiseload("*", sql_only=True),
+    selectinload(Account.organizations).raiseload("*", sql_only=True),
+    raiseload("*", sql_only=True),
+)
 
-        db.add(db_account)
 
-        # Create account profile
-        db_account_profile = AccountProfile(
-            account=db_account, full_name=account.full_name
-        )
-        db.add(db_account_profile)
-
-        # Create default organization
-        db_account_org = Organization(
-            account=db_account,
-            name="Default org",
-            description="Default organization",
-            is_default_org=True,
-        )
-        db.add(db_account_org)
-
-        # Create default project
-        db_account_project = Project(
-            organization=db_account_org,
-            name="Default project",
-            description="Default project",
-            is_default_project=True,
-        )
-        db.add(db_account_project)
+def _insert_from_select(table, values: dict, **foreign_keys):
+    """INSERT ... SELECT of constant values plus columns taken from a CTE."""
+    columns = [*values, *foreign_keys]
+    row = select(
+        *(literal(value, table.c[key].type) for key, value in values.items()),
+        *foreign_keys.values(),
+    )
+    return insert(table).from_select(columns, row)
 
-        logger.debug(f"Created user account: {db_account.email.lower()}")
 
-    return db_account
+async def create_account(
+    db: AsyncSession, account: AccountCreate, locale: Optional[str] = None
+) -> Account:
+    logger.debug("Creating user account: %s", account.email)
+
+    # Hash off the event loop, before the session checks out a connection
+    hashed_password = (
+        await get_password_hash_async(account.password) if account.password else None
+    )
+
+    now = utc_now()
+    account_values = dict(
+        email=account.email.lower(),
+        hashed_password=hashed_password,
+        disabled=account.disabled,
+        account_type=account.account_type,
+        uid=account.uid if account.uid else uuid7(),
+        created_at=now,
+        updated_at=now,
+    )
+    profile_values = dict(
+        full_name=account.full_name, uid=uuid7(), created_at=now, updated_at=now
+    )
+    org_values = dict(
+        public_id=generate_public_id(prefix="org"),
+        name="Default org",
+        description="Default organization",
+        is_default_org=True,
+        uid=uuid7(),
+        created_at=now,
+        updated_at=now,
+    )
+    project_values = dict(
+        public_id=generate_public_id(prefix="project"),
+        name="Default project",
+        description="Default project",
+        is_default_project=True,
+        uid=uuid7(),
+        created_at=now,
+        updated_at=now,
+    )
 
+    account_table = Account.__table__
+    profile_table = AccountProfile.__table__
+    org_table = Organization.__table__
+    project_table = Project.__table__
 
-async def update_account(db: Session, account: AccountUpdate) -> Account:
-    db_account = db.exec(select(Account).where(Account.id == account.id)).first()
+    # The unique index on lower(email) is the source of truth for duplicates
+    try:
+        async with db.begin():
+            if db.bind.dialect.name == "postgresql":
+                # One round trip: chained data-modifying CTEs
+                new_account = (
+                    insert(account_table)
+                    .values(**account_values)
+                    .returning(account_table.c.id)
+                    .cte("new_account")
+                )
+                new_profile = _insert_from_select(
+                    profile_table, profile_values, account_id=new_account.c.id
+                ).cte("new_profile")
+                new_org = (
+                    _insert_from_select(
+                        org_table, org_values, account_id=new_account.c.id
+                    )
+                    .returning(org_table.c.id)
+                    .cte("new_org")
+                )
+                new_project = _insert_from_select(
+                    project_table, project_values, organization_id=new_org.c.id
+                ).cte("new_project")
+                account_id = (
+                    await db.exec(
+                        select(new_account.c.id).add_cte(new_profile, new_project)
+                    )
+                ).one()
+            else:
+                account_id = (
+                    await db.exec(
+                        insert(account_table)
+                        .values(**account_values)
+                        .returning(account_table.c.id)
+                    )
+                ).scalar_one()
+                await db.exec(
+                    insert(profile_table).values(account_id=account_id, **profile_values)
+                )
+                org_id = (
+                    await db.exec(
+                        insert(org_table)
+                        .values(account_id=account_id, **org_values)
+                        .returning(org_table.c.id)
+                    )
+                ).scalar_one()
+                await db.exec(
+                    insert(project_table).values(organization_id=org_id, **project_values)
+                )
+            # Committed with the account, sent by the outbox worker
+            enqueue_email(
+                db, EmailKind.WELCOME, account_values["email"], locale=locale
+            )
+    except IntegrityError as e:
+        if get_violated_constraint(e) == ACCOUNT_EMAIL_INDEX:
+            raise EmailAlreadyExistsException
+        raise
+
+    logger.debug("Created user account: %s", account_values["email"])
+
+    return Account(id=account_id, **account_values)
+
+
+async def update_account(db: AsyncSession, account: AccountUpdate) -> Account:
+    db_account = (
+        await db.exec(select(Account).where(Account.id == account.id))
+    ).first()
     if not db_account:
         raise HTTPException(status_code=404, detail="Account not found")
     account_data = account.model_dump(exclude_unset=True)
     for key, value in account_data.items():
         if key == "password":
-            db_account.hashed_password = get_password_hash(value)
+            db_account.hashed_password = await get_password_hash_async(value)
         else:
             setattr(db_account, key, value)
 
     db.add(db_account)
-    db.commit()
-    db.refresh(db_account)
+    await db.commit()
+    await db.refresh(db_account)
+
+    # Write-through: drop the old entry (email may have changed) and cache the new one
+    invalidate_account_principal(db_account.id)
+    cache_account_principal(db_account)
+    invalidate_account_profile(db_account.id)
 
     return db_account
 
 
-async def delete_account(db: Session, account: AccountDelete) -> Account:
+async def delete_account(db: AsyncSession, account: AccountDelete) -> Account:
+    # Must call invalidate_account_principal(account.id) and
+    # invalidate_account_profile(account.id) once implemented
     raise APINotImplementedError
 
 
-async def get_account(db: Session, account_id: int) -> Optional[Account]:
-    account = db.exec(select(Account).where(Account.id == account_id)).first()
+async def get_account(db: AsyncSession, account_id: int) -> Optional[Account]:
+    account = (await db.exec(select(Account).where(Account.id == account_id))).first()
     return account
 
 
-async def get_account_profile(db: Session, account_id: int):
-    account, profile = db.exec(
-        select(Account, AccountProfile)
-        .join(AccountProfile)
-        .where(Account.id == account_id)
+async def get_account_profile(db: AsyncSession, account_id: int):
+    account, profile = (
+        await db.exec(
+            select(Account, AccountProfile)
+            .join(AccountProfile)
+            .where(Account.id == account_id)
+            .options(*PROFILE_LOAD_OPTIONS)
+        )
     ).first()
     return AccountProfileMe(
         uid=account.uid,
@@ -121,19 +251,215 @@ async def get_account_profile(db: Session, account_id: int):
     )
 
 
-async def get_account_by_email(db: Session, email: str) -> Optional[Account]:
+async def get_account_profile_etag(db: AsyncSession, account_id: int) -> str:
+    """ETag of the profile from one cheap query, without loading the profile.
+
+    Every table in the response carries updated_at; the row counts catch
+    deleted organizations and projects.
+    """
+    org_filter = Organization.account_id == account_id
+    project_filter = Project.organization_id.in_(
+        select(Organization.id).where(org_filter)
+    )
+    validator = (
+        await db.exec(
+            select(
+                Account.updated_at,
+                AccountProfile.updated_at,
+                select(func.max(Organization.updated_at))
+                .where(org_filter)
+                .scalar_subquery(),
+                select(func.count())
+                .select_from(Organization)
+                .where(org_filter)
+                .scalar_subquery(),
+                select(func.max(Project.updated_at))
+                .where(project_filter)
+                .scalar_subquery(),
+                select(func.count())
+                .select_from(Project)
+                .where(project_filter)
+                .scalar_subquery(),
+            )
+            .join(AccountProfile, AccountProfile.account_id == Account.id)
+            .where(Account.id == account_id)
+        )
+    ).first()
+    return make_etag(PROFILE_ETAG_VERSION, account_id, *(validator or ()))
+
+
+async def get_account_profile_json(
+    db: AsyncSession, account_id: int, etag: str
+) -> bytes:
+    """The serialized profile for a freshly read ETag, from cache when current.
+
+    Concurrent misses for the same version share one load, which runs in its
+    own session so it outlives any single caller. ``db`` is closed on a miss.
+    """
+    cached = account_profile_cache.get(account_id)
+    if cached is not None and cached[0] == etag:
+        return cached[1]
+
+    # Give the caller's connection back before the load checks out its own;
+    # holding both per miss starves the pool under a burst of misses
+    await db.close()
+
+    async def load() -> bytes:
+        async with async_session_factory() as session:
+            profile = await get_account_profile(session, account_id)
+        body = dump_model_json(AccountProfileMe, profile)
+        # The body is at least as new as the ETag, read before it
+        account_profile_cache.set(account_id, (etag, body))
+        return body
+
+    return await account_profile_loads.do((account_id, etag), load)
+
+
+def invalidate_account_profile(account_id: int) -> None:
+    """Drop the cached profile.
+
+    Call after any write to the account, its profile, organizations or projects.
+    """
+    account_profile_cache.pop(account_id)
+
+
+async def get_account_by_email(db: AsyncSession, email: str) -> Optional[Account]:
     logger.debug("get_account_by_email")
-    result = db.exec(select(Account).where(Account.email == email.lower())).first()
+    result = (
+        await db.exec(
+            select(Account).where(func.lower(Account.email) == email.lower())
+        )
+    ).first()
     return result
 
 
-# async def get_account_by_api_key(db: Session, api_key: str) -> Optional[Account]:
+def cache_account_principal(account: Account) -> AccountPrincipal:
+    principal = AccountPrincipal(
+        id=account.id,
+        uid=account.uid,
+        email=account.email,
+        disabled=account.disabled,
+        account_type=account.account_type,
+        has_password=bool(account.hashed_password),
+    )
+    account_principal_cache.set(("id", principal.id), principal)
+    account_principal_cache.set(("email", principal.email), principal)
+    return principal
+
+
+def invalidate_account_principal(account_id: int) -> None:
+    """Evict an account from the principal cache.
+
+    Every path that changes, disables or deletes an account must call this so
+    the change is seen by the next request on this worker.
+    """
+    principal = account_principal_cache.pop(("id", account_id))
+    if principal is not None:
+        account_principal_cache.pop(("email", principal.email))
+
+
+async def get_account_principal(
+    db: AsyncSession, account_id: int
+) -> Optional[AccountPrincipal]:
+    principal = account_principal_cache.get(("id", account_id))
+    if principal is None:
+        account = await get_account(db, account_id)
+        if account is None:
+            return None
+        principal = cache_account_principal(account)
+    return principal
+
+
+async def get_account_principal_by_email(
+    db: AsyncSession, email: str
+) -> Optional[AccountPrincipal]:
+    principal = account_principal_cache.get(("email", email.lower()))
+    if principal is None:
+        account = await get_account_by_email(db, email)
+        if account is None:
+            return None
+        principal = cache_account_principal(account)
+    return principal
+
+
+# async def get_account_by_api_key(db: AsyncSession, api_key: str) -> Optional[Account]:
 #     result = db.exec(
 #         select(Account).join(APIKey).where(APIKey.key == api_key, APIKey.is_active)
 #     ).first()
 #     return result
 
 
-async def get_accounts(db: Session, skip: int = 0, limit: int = 100) -> List[Account]:
-    result = db.exec(select(Account).offset(skip).limit(limit))
-    return result.scalars().all()
+# ******** Admin listing ******************************************************
+# Accounts are paged by keyset on (created_at, id), backed by
+# ix_account_created_at_id, so deep pages cost the same as the first one.
+
+
+def encode_account_cursor(account: Account) -> str:
+    raw = json.dumps([account.created_at.isoformat(), account.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_account_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, account_id = json.loads(base64.urlsafe_b64decode(cursor))
+        created_at = datetime.fromisoformat(created_at)
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return created_at, int(account_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorException
+
+
+def get_accounts_query(
+    account_type: Optional[AccountType] = None,
+    disabled: Optional[bool] = None,
+    after: Optional[tuple[datetime, int]] = None,
+):
+    query = select(Account)
+    if account_type is not None:
+        query = query.where(Account.account_type == account_type)
+    if disabled is not None:
+        query = query.where(Account.disabled == disabled)
+    if after is not None:
+        query = query.where(tuple_(Account.created_at, Account.id) > tuple_(*after))
+    return query.order_by(Account.created_at, Account.id)
+
+
+async def get_accounts(
+    db: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    account_type: Optional[AccountType] = None,
+    disabled: Optional[bool] = None,
+) -> AccountPage:
+    after = decode_account_cursor(cursor) if cursor else None
+    query = get_accounts_query(account_type, disabled, after)
+    # Fetch one extra row to know whether another page exists
+    accounts = (await db.exec(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(accounts) > limit:
+        accounts = accounts[:limit]
+        next_cursor = encode_account_cursor(accounts[-1])
+    return AccountPage(
+        items=[AccountListItem.model_validate(a, from_attributes=True) for a in accounts],
+        next_cursor=next_cursor,
+    )
+
+
+async def stream_accounts(
+    account_type: Optional[AccountType] = None,
+    disabled: Optional[bool] = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[AccountListItem]:
+    """Yield every matching account from a server-side cursor.
+
+    Opens its own session because the rows are consumed while the response
+    body streams, after request-scoped dependencies may have been closed.
+    """
+    query = get_accounts_query(account_type, disabled).execution_options(
+        yield_per=batch_size
+    )
+    async with async_session_factory() as session:
+        result = await session.stream_scalars(query)
+        async for account in result:
+            yield AccountListItem.model_validate(account, from_attributes=True)
@@ -9,7 +9,7 @@ from app.accounts.models import Account
 from app.accounts.services import get_account_by_email
 from app.auth.models import Token
 from app.auth.services.jwt import create_access_token
-from app.auth.services.security import verify_password
+from app.auth.services.security import verify_password_async
 from app.core.exceptions import AccountDisabledException
 from app.core.logging import get_logger, setup_logging
 
@@ -24,7 +24,7 @@ async def authenticate_user(
     user_account = await get_account_by_email(db, email=email)
     if not user_account:
         return None
-    if not verify_password(password, user_account.hashed_password):
+    if not await verify_password_async(password, user_account.hashed_password):
         return None
     return user_account
 
@@ -1,5 +1,6 @@
 """JWT service for token handling."""
 
+import hashlib
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
@@ -9,6 +10,7 @@ from jose import ExpiredSignatureError, JWTError, jwt
 from jwt import InvalidSignatureError
 
 from app.auth import models
+from app.core.cache import LRUCache
 from app.core.config import secret_settings, settings
 from app.core.exceptions import InvalidAccessTokenException
 from app.core.logging import get_logger, setup_logging
@@ -16,6 +18,9 @@ from app.core.logging import get_logger, setup_logging
 setup_logging()
 logger = get_logger(__name__)
 
+# Verified token payloads keyed by sha256(token). Entries expire with the token.
+token_cache = LRUCache(maxsize=settings.TOKEN_CACHE_MAXSIZE)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -59,6 +64,11 @@ def create_refresh_token(data: dict) -> str:
 
 
 def verify_access_token(token: str) -> Optional[models.TokenPayload]:
+    cache_key = hashlib.sha256(token.encode()).digest()
+    token_data = token_cache.get(cache_key)
+    if token_data is not None:
+        return token_data
+
     try:
         # Decode and verify signature
         payload = jwt.decode(
@@ -76,11 +86,15 @@ def verify_access_token(token: str) -> Optional[models.TokenPayload]:
 
         # Add more claim checks here if needed (e.g. aud, iss)
 
+        # Only tokens with an expiry are cached, so a hit can never outlive it
+        if token_data.exp:
+            token_cache.set(cache_key, token_data, expires_at=token_data.exp)
+
         return token_data
 
     except (JWTError, InvalidSignatureError, ExpiredSignatureError, ValueError) as e:
-        logger.debug(f"verify_access_token: token={token}")
-        logger.debug(f"verify_access_token: {e}")
+        logger.debug("verify_access_token: token=%s", token)
+        logger.debug("verify_access_token: %s", e)
         raise e
 
 
@@ -1,8 +1,15 @@
 """Security service for authentication and authorization."""
 
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 
+from app.core.config import settings
+from app.core.exceptions import PasswordHashingUnavailableException
 from app.core.logging import get_logger, setup_logging
 
 setup_logging()
@@ -19,3 +26,86 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+# ******** Async hashing ******************************************************
+# bcrypt takes 100-300 ms per call, so the async variants run it on a bounded
+# pool. Calls beyond PASSWORD_HASH_MAX_WORKERS + PASSWORD_HASH_MAX_QUEUE are
+# shed with a 503 instead of piling up behind the pool.
+
+
+class HashingStats:
+    def __init__(self):
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.completed += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - settings.PASSWORD_HASH_MAX_WORKERS),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_latency_ms": (
+                self.total_seconds / self.completed * 1000 if self.completed else 0.0
+            ),
+            "max_latency_ms": self.max_seconds * 1000,
+        }
+
+
+hashing_stats = HashingStats()
+_executor: Optional[Executor] = None
+
+
+def get_hash_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_MAX_WORKERS
+            )
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_MAX_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+    return _executor
+
+
+def shutdown_hash_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _run_hashing(func, *args):
+    capacity = settings.PASSWORD_HASH_MAX_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE
+    if hashing_stats.in_flight >= capacity:
+        hashing_stats.rejected += 1
+        logger.warning("Password hashing pool saturated (%d in flight)", capacity)
+        raise PasswordHashingUnavailableException
+
+    hashing_stats.in_flight += 1
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_hash_executor(), func, *args)
+    finally:
+        hashing_stats.in_flight -= 1
+        hashing_stats.record(time.perf_counter() - start)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hashing(get_password_hash, password)
@@ -0,0 +1,11 @@
+from datetime import datetime, timezone
+
+
+def utc_now() -> datetime:
+    """Current UTC time without tzinfo.
+
+    Timestamp columns are TIMESTAMP WITHOUT TIME ZONE holding UTC. asyncpg
+    rejects aware datetimes for them, so values written to the database must
+    be naive.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,288 @@
+"""Negotiated zstd / br / gzip response compression.
+
+zstd and br need the optional ``compression`` extra (zstandard, brotli) and
+are only offered when importable; gzip is always available. Compression
+levels are chosen per content type, and types that are not listed (images,
+vector tiles, archives) are passed through untouched. Streaming responses
+keep one compressor context for the whole body and flush it per chunk.
+"""
+
+import time
+import zlib
+from typing import Optional, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Server preference when the client accepts several encodings equally
+ENCODINGS = [
+    name
+    for name, available in (
+        ("zstd", zstandard is not None),
+        ("br", brotli is not None),
+        ("gzip", True),
+    )
+    if available
+]
+
+DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+# Streamed exports favour throughput: every chunk is compressed on the loop
+STREAMING_LEVELS = {"zstd": 1, "br": 1, "gzip": 4}
+
+# Compressible content types and their levels; "text/" matches by prefix
+CONTENT_TYPE_LEVELS = {
+    "application/json": DEFAULT_LEVELS,
+    "application/geo+json": DEFAULT_LEVELS,
+    "application/problem+json": DEFAULT_LEVELS,
+    "application/x-ndjson": STREAMING_LEVELS,
+    "application/javascript": DEFAULT_LEVELS,
+    "application/xml": DEFAULT_LEVELS,
+    "image/svg+xml": DEFAULT_LEVELS,
+    "text/": DEFAULT_LEVELS,
+}
+
+
+# ******** Compressors ********************************************************
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+COMPRESSORS = {"zstd": ZstdCompressor, "br": BrotliCompressor, "gzip": GzipCompressor}
+
+
+# ******** Negotiation ********************************************************
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best available encoding from an Accept-Encoding header."""
+    if not accept_encoding:
+        return None
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        params = params.strip()
+        try:
+            quality = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            continue
+        accepted[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for name in ENCODINGS:
+        quality = accepted.get(name, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def get_levels(content_type: str) -> Optional[dict[str, int]]:
+    """Levels for a content type, or None if it should not be compressed."""
+    media_type = content_type.split(";")[0].strip().lower()
+    levels = settings.COMPRESSION_LEVELS.get(media_type)
+    if levels is None:
+        levels = CONTENT_TYPE_LEVELS.get(media_type)
+    if levels is None and media_type.startswith("text/"):
+        levels = CONTENT_TYPE_LEVELS["text/"]
+    return levels
+
+
+# ******** Metrics ************************************************************
+class CompressionMetrics:
+    def __init__(self):
+        self.responses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+        self.cpu_seconds_max = 0.0
+
+    def record(self, bytes_in: int, bytes_out: int, cpu_seconds: float) -> None:
+        self.responses += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.cpu_seconds += cpu_seconds
+        self.cpu_seconds_max = max(self.cpu_seconds_max, cpu_seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "responses": self.responses,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": self.bytes_in / self.bytes_out if self.bytes_out else 0.0,
+            "avg_cpu_ms": (
+                self.cpu_seconds / self.responses * 1000 if self.responses else 0.0
+            ),
+            "max_cpu_ms": self.cpu_seconds_max * 1000,
+        }
+
+
+compression_metrics: dict[str, CompressionMetrics] = {}
+
+
+def get_compression_metrics() -> dict:
+    return {
+        "available": ENCODINGS,
+        "encodings": {
+            name: m.as_dict() for name, m in sorted(compression_metrics.items())
+        },
+    }
+
+
+# ******** Middleware *********************************************************
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.started = False
+        self.compressor: Optional[Compressor] = None
+        self.passthrough = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk tells us the size
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            # Trailers, pathsend...: the body does not go through us, send as is
+            if self.start_message is not None and not self.started:
+                self.passthrough = True
+                await self._send_start()
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = MutableHeaders(scope=self.start_message)
+            levels = get_levels(headers.get("content-type", ""))
+            if levels is not None:
+                headers.add_vary_header("Accept-Encoding")
+            if (
+                levels is None
+                or "content-encoding" in headers
+                or (not more_body and len(body) < self.minimum_size)
+            ):
+                self.passthrough = True
+                await self._send_start()
+                await self._send(message)
+                return
+
+            level = levels.get(self.encoding, DEFAULT_LEVELS[self.encoding])
+            self.compressor = COMPRESSORS[self.encoding](level)
+            headers["Content-Encoding"] = self.encoding
+            if "content-length" in headers:
+                del headers["content-length"]
+            # The compressed bytes are a different representation
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+
+            data = self._compress(body, more_body)
+            if not more_body:
+                headers["Content-Length"] = str(len(data))
+            await self._send_start()
+        else:
+            data = self._compress(body, more_body)
+
+        await self._send(
+            {"type": "http.response.body", "body": data, "more_body": more_body}
+        )
+        if not more_body:
+            compression_metrics.setdefault(
+                self.encoding, CompressionMetrics()
+            ).record(self.bytes_in, self.bytes_out, self.cpu_seconds)
+
+    async def _send_start(self) -> None:
+        self.started = True
+        await self._send(self.start_message)
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        started = time.thread_time()
+        data = self.compressor.compress(body)
+        data += self.compressor.flush() if more_body else self.compressor.finish()
+        self.cpu_seconds += time.thread_time() - started
+        self.bytes_in += len(body)
+        self.bytes_out += len(data)
+        return data
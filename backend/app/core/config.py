@@ -1,9 +1,12 @@
 import secrets
+from pathlib import Path
 from typing import Annotated, Any, Literal
 
 from pydantic import AnyUrl, BeforeValidator, EmailStr, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
 
 def parse_cors(v: Any) -> list[str] | str:
     if isinstance(v, str) and not v.startswith("["):
@@ -21,11 +24,19 @@ class Settings(BaseSettings):
     )
 
     LOG_LEVEL: str = "warning"
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    # Fraction of DEBUG records kept per logger, e.g. {"app.dependencies": 0.01}
+    LOG_SAMPLING: dict[str, float] = {}
     PROJECT_NAME: str = "fastapi-backend"
     BRAND_NAME: str = "tibrahim.dev"
     APP_URL: str = "https://www.example.com"
     FRONTEND_HOST: str = "http://localhost:5173"
     ENVIRONMENT: Literal["local", "staging", "production"] = "staging"
+    DEFAULT_LOCALE: str = "en"
+    SUPPORTED_LOCALES: Annotated[list[str] | str, BeforeValidator(parse_cors)] = [
+        "en",
+        "id",
+    ]
     BACKEND_CORS_ORIGINS: Annotated[list[AnyUrl] | str, BeforeValidator(parse_cors)] = (
         []
     )
@@ -41,8 +52,45 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 1  # default 1 hour
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7  # default 7 days
     RESET_TOKEN_EXPIRY_MINUTES: int = 15  # default 15 minutes
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_MAX_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # waiting hashes before shedding with 503
+    ADMIN_EMAILS: Annotated[list[str] | str, BeforeValidator(parse_cors)] = []
     ENABLE_SERVICE_ACCOUNT_AUTH: bool = True
     API_KEY_HEADER: str = "x-api-key"
+    TOKEN_CACHE_MAXSIZE: int = 10_000  # verified tokens kept in memory, 0 disables
+    ACCOUNT_CACHE_MAXSIZE: int = 10_000  # account principals kept in memory, 0 disables
+    # Other workers see a disabled or changed account only after this long
+    ACCOUNT_CACHE_TTL_SECONDS: int = 5
+    PROFILE_CACHE_MAXSIZE: int = 10_000  # serialized /profile/me bodies, 0 disables
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = 1800  # seconds, -1 never recycles
+    DB_POOL_PRE_PING: bool = True
+    ENABLE_DEBUG_ENDPOINTS: bool = False
+    ENABLE_SQL_INSTRUMENTATION: bool = True
+    # Sends every client its statement count and DB time; keep off in production
+    SQL_SERVER_TIMING_HEADER: bool = False
+    SQL_N_PLUS_ONE_THRESHOLD: int = 0  # identical statements per request to flag, 0 disables
+    STREAM_CHUNK_SIZE: int = 64 * 1024  # bytes buffered per chunk of streamed exports
+    COMPRESSION_MINIMUM_SIZE: int = 1000  # smaller complete responses are sent as is
+    # Levels by content type, e.g. {"application/json": {"zstd": 6, "gzip": 6}}
+    COMPRESSION_LEVELS: dict[str, dict[str, int]] = {}
+
+    # Relative paths are resolved against the backend directory, not the
+    # working directory of the process
+    CACHE_DIR: str = ".cache"
+    TILE_CACHE_DIR: str = "tiles"  # disk cache shared by a host's workers, in CACHE_DIR
+    TILE_MEMORY_CACHE_MAXSIZE: int = 4096  # tiles in memory per worker, 0 disables
+    TILE_DATASET_CACHE_TTL_SECONDS: int = 5  # how long a dataset version is trusted
+    TILE_MAX_AGE_SECONDS: int = 60  # browser cache lifetime of a tile
+
+    @property
+    def tile_cache_path(self) -> Path:
+        # An absolute directory replaces everything before it
+        return BACKEND_DIR / self.CACHE_DIR / self.TILE_CACHE_DIR
 
     UPLOAD_BACKEND: Literal["minio", "s3", "uploadthing"] = "minio"
     UPLOAD_BACKEND_S3_BUCKET_NAME: str = "your-s3-bucket-name"
@@ -59,6 +107,8 @@ class SecretSettings(BaseSettings):
     )
     SECRET_KEY: str = secrets.token_urlsafe(32)
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///db.sqlite3"
+    # Derived from SQLALCHEMY_DATABASE_URI (asyncpg / aiosqlite) when empty
+    SQLALCHEMY_ASYNC_DATABASE_URI: str = ""
     UPLOAD_BACKEND_UPLOADTHING_SECRET: str = "sk_live_****"
 
 
@@ -73,6 +123,20 @@ class MailSettings(BaseSettings):
     MAIL_SMTP_PORT: int = 587
     MAIL_SMTP_USERNAME: str = "your-email@yourdomain.com"
     MAIL_SMTP_PASSWORD: str = "your-app-password"
+    MAIL_SMTP_START_TLS: bool = True
+    MAIL_SMTP_USE_TLS: bool = False
+    MAIL_SMTP_TIMEOUT: float = 30
+    MAIL_SMTP_POOL_SIZE: int = 4  # concurrent sessions per SMTP host
+    MAIL_SMTP_IDLE_TIMEOUT_SECONDS: float = 60
+    MAIL_SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
+
+    OUTBOX_BATCH_SIZE: int = 50  # messages claimed per poll
+    OUTBOX_CONCURRENCY: int = 8  # messages sent at once per worker
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 2  # idle wait when nothing is due
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_BACKOFF_BASE_SECONDS: float = 30  # doubled after every failed attempt
+    OUTBOX_BACKOFF_MAX_SECONDS: float = 3600
+    OUTBOX_CLAIM_TIMEOUT_SECONDS: float = 300  # reclaim rows of crashed workers
 
 
 class DemoSettings(BaseSettings):
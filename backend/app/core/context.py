@@ -0,0 +1,59 @@
+"""Request-scoped context shared by middlewares, logging and instrumentation."""
+
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_ID_HEADER = "x-request-id"
+
+
+class RequestContext:
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.request_id = (
+            Headers(scope=scope).get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+        )
+        self.query_stats = None
+
+    @property
+    def operation_id(self) -> Optional[str]:
+        # Routing stores the matched route in the (shared) scope
+        route = self.scope.get("route")
+        return getattr(route, "operation_id", None)
+
+
+request_context: ContextVar[Optional[RequestContext]] = ContextVar(
+    "request_context", default=None
+)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    return request_context.get()
+
+
+class RequestContextMiddleware:
+    """Bind a RequestContext for the request and echo its id in the response."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(scope)
+        token = request_context.set(ctx)
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = ctx.request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_context.reset(token)
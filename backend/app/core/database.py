@@ -1,17 +1,159 @@
+import re
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import secret_settings, settings
+from app.core.instrumentation import install_query_instrumentation
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def get_async_database_uri(uri: str) -> str:
+    """Map a sync database URI onto the matching async driver."""
+    scheme, sep, rest = uri.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def get_violated_constraint(error: exc.IntegrityError) -> Optional[str]:
+    """Name of the constraint or unique index an IntegrityError reports."""
+    # asyncpg errors arrive wrapped by the SQLAlchemy adapter, psycopg2 has diag
+    for details in (error.orig.__cause__, getattr(error.orig, "diag", None)):
+        name = getattr(details, "constraint_name", None)
+        if name:
+            return name
+    # SQLite only names it in the message
+    match = re.search(r"index '([^']+)'", str(error.orig))
+    return match.group(1) if match else None
+
+
+# ******** Pool metrics *******************************************************
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": (
+                self.wait_seconds_total / self.checkouts * 1000
+                if self.checkouts
+                else 0.0
+            ),
+            "max_wait_ms": self.wait_seconds_max * 1000,
+        }
+
+
+class _TimedCheckoutMixin:
+    """Measure how long callers wait for a pooled connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    metrics = PoolMetrics()
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
 
-from app.core.config import secret_settings
 
+def get_pool_options(poolclass) -> dict:
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def get_pool_status(pool) -> dict:
+    status = {"class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.as_dict())
+    return status
+
+
+# ******** Engines ************************************************************
+SQLALCHEMY_ASYNC_DATABASE_URI = (
+    secret_settings.SQLALCHEMY_ASYNC_DATABASE_URI
+    or get_async_database_uri(secret_settings.SQLALCHEMY_DATABASE_URI)
+)
+
+# The sync engine serves migrations, scripts and local tooling
 if secret_settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite"):
     engine = create_engine(
         secret_settings.SQLALCHEMY_DATABASE_URI,
         connect_args={"check_same_thread": False},
     )
 else:
-    engine = create_engine(secret_settings.SQLALCHEMY_DATABASE_URI)
+    engine = create_engine(
+        secret_settings.SQLALCHEMY_DATABASE_URI,
+        **get_pool_options(InstrumentedQueuePool),
+    )
 
+# The async engine serves request handlers
+if SQLALCHEMY_ASYNC_DATABASE_URI.startswith("sqlite"):
+    async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URI)
+else:
+    async_engine = create_async_engine(
+        SQLALCHEMY_ASYNC_DATABASE_URI,
+        **get_pool_options(InstrumentedAsyncAdaptedQueuePool),
+    )
+
+install_query_instrumentation(engine)
+install_query_instrumentation(async_engine.sync_engine)
+
+async_session_factory = async_sessionmaker(
+    async_engine, class_=AsyncSession, expire_on_commit=False
+)
 
-def get_db():
+
+async def get_db():
+    async with async_session_factory() as session:
+        yield session
+
+
+def get_sync_db():
     with Session(engine) as session:
         yield session
 
@@ -19,3 +161,10 @@ def get_db():
 def create_db_and_tables():
     engine = create_engine(secret_settings.SQLALCHEMY_DATABASE_URI)
     SQLModel.metadata.create_all(engine)
+
+
+def get_database_pool_status() -> dict:
+    return {
+        "async": get_pool_status(async_engine.pool),
+        "sync": get_pool_status(engine.pool),
+    }
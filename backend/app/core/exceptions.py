@@ -45,6 +45,22 @@ class AccountDisabledException(BaseAPIError):
     message = "Account disabled"
 
 
+class InsufficientPermissionsException(BaseAPIError):
+    """Raised when an authenticated account lacks the required role."""
+
+    status_code = status.HTTP_403_FORBIDDEN
+    error_code = "INSUFFICIENT_PERMISSIONS"
+    message = "Insufficient permissions"
+
+
+class InvalidCursorException(BaseAPIError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    status_code = status.HTTP_400_BAD_REQUEST
+    error_code = "INVALID_CURSOR"
+    message = "Invalid pagination cursor"
+
+
 class EmailAlreadyExistsException(BaseAPIError):
     """Raised when trying to register with an email that already exists."""
 
@@ -67,3 +83,27 @@ class InvalidAccessTokenException(BaseAPIError):
     status_code = status.HTTP_401_UNAUTHORIZED
     error_code = "INVALID_ACCESS_TOKEN"
     message = "Invalid access token"
+
+
+class PasswordHashingUnavailableException(BaseAPIError):
+    """Raised when the password hashing pool is saturated."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    error_code = "PASSWORD_HASHING_UNAVAILABLE"
+    message = "Service is busy, please retry shortly"
+
+
+class DatasetNotFoundException(BaseAPIError):
+    """Raised when a dataset has no registered tile source."""
+
+    status_code = status.HTTP_404_NOT_FOUND
+    error_code = "DATASET_NOT_FOUND"
+    message = "Dataset not found"
+
+
+class InvalidTileCoordinatesException(BaseAPIError):
+    """Raised when x or y is outside the tile grid of zoom z."""
+
+    status_code = status.HTTP_400_BAD_REQUEST
+    error_code = "INVALID_TILE_COORDINATES"
+    message = "Tile coordinates are outside the tile grid"
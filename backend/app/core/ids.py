@@ -0,0 +1,139 @@
+"""Time-ordered identifiers.
+
+``uuid7()`` returns RFC 9562 UUIDv7 values: a 48-bit millisecond timestamp,
+a 12-bit counter that keeps ids from one process monotonic within the same
+millisecond, and 62 random bits. ``generate_public_id()`` returns
+``<prefix>-<9 base62 chars of microseconds><16 random base62 chars>``, which
+sorts by creation time as a plain string.
+
+New keys land at the right edge of their btree indexes instead of random
+pages. Randomness comes from os.urandom read in blocks, not one call per id
+or per character.
+
+Public ids keep the 16 random characters (95 bits) of the old ids. The
+timestamp is in microseconds because minting one takes a few of them, so
+consecutive ids from a process are ordered: with milliseconds, ids of the
+same millisecond arrive in random order and split the rightmost index page
+in half instead of filling it.
+"""
+
+import os
+import threading
+import time
+import uuid
+
+# ASCII order, so base62 strings sort like the numbers they encode
+BASE62 = b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+# Bytes >= 248 (4 * 62) are dropped so every character is equally likely
+_BASE62_TABLE = bytes(BASE62[b % 62] for b in range(256))
+_BASE62_REJECT = bytes(range(248, 256))
+TIMESTAMP_LENGTH = 9  # 62**9 us after 1970 runs out in the year ~2400
+
+
+class RandomBuffer:
+    """Hand out slices of os.urandom read ``size`` bytes at a time."""
+
+    def __init__(self, size: int = 4096):
+        self.size = size
+        self._buffer = b""
+        self._pos = 0
+        self._lock = threading.Lock()
+
+    def take(self, n: int) -> bytes:
+        with self._lock:
+            if self._pos + n > len(self._buffer):
+                self._buffer = os.urandom(max(self.size, n))
+                self._pos = 0
+            chunk = self._buffer[self._pos : self._pos + n]
+            self._pos += n
+            return chunk
+
+    def reseed(self) -> None:
+        # A forked child must not replay its parent's buffered bytes
+        self._buffer = b""
+        self._pos = 0
+
+
+_random = RandomBuffer()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_random.reseed)
+
+
+class UUIDv7Generator:
+    def __init__(self, buffer_size: int = 4096):
+        self.buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._counter = 0
+        self._buffer = b""
+        self._pos = 0
+
+    def reseed(self) -> None:
+        self._buffer = b""
+        self._pos = 0
+
+    def __call__(self) -> uuid.UUID:
+        with self._lock:
+            # Own block of random bytes, so one lock covers bytes and counter
+            pos = self._pos
+            if pos + 10 > len(self._buffer):
+                self._buffer = os.urandom(self.buffer_size)
+                pos = 0
+            self._pos = pos + 10
+            rand = int.from_bytes(self._buffer[pos : pos + 10], "big")
+
+            ms = time.time_ns() // 1_000_000
+            if ms > self._last_ms:
+                self._last_ms = ms
+                # Random start, with headroom to count up within this millisecond
+                self._counter = (rand >> 64) & 0x7FF
+            else:
+                self._counter += 1
+                if self._counter > 0xFFF:
+                    # Counter exhausted: borrow the next millisecond
+                    self._last_ms += 1
+                    self._counter = 0
+            ms, counter = self._last_ms, self._counter
+
+        value = (
+            (ms & 0xFFFF_FFFF_FFFF) << 80
+            | 0x7 << 76
+            | counter << 64
+            | 0b10 << 62
+            | rand & 0x3FFF_FFFF_FFFF_FFFF
+        )
+        # Skip UUID.__init__ argument parsing; value is already a valid UUID
+        u = _new_uuid(uuid.UUID)
+        _set_attr(u, "int", value)
+        _set_attr(u, "is_safe", uuid.SafeUUID.unknown)
+        return u
+
+
+_new_uuid = object.__new__
+_set_attr = object.__setattr__
+uuid7 = UUIDv7Generator()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=uuid7.reseed)
+
+
+def base62_encode(number: int, length: int) -> str:
+    chars = bytearray(length)
+    for i in range(length - 1, -1, -1):
+        number, remainder = divmod(number, 62)
+        chars[i] = BASE62[remainder]
+    return chars.decode("ascii")
+
+
+def random_base62(length: int) -> str:
+    out = b""
+    while len(out) < length:
+        # ~3% of bytes are rejected; ask for a little more than needed
+        out += _random.take(length + length // 8 + 2).translate(
+            _BASE62_TABLE, _BASE62_REJECT
+        )
+    return out[:length].decode("ascii")
+
+
+def generate_public_id(prefix="org", random_length=16):
+    timestamp = base62_encode(time.time_ns() // 1_000, TIMESTAMP_LENGTH)
+    return f"{prefix}-{timestamp}{random_base62(random_length)}"
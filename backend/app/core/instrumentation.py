@@ -0,0 +1,155 @@
+"""Per-request SQL instrumentation.
+
+Engine events record every statement into the current request's QueryStats.
+QueryInstrumentationMiddleware folds them into per-operation metrics once the
+request is done and, with SQL_SERVER_TIMING_HEADER, reports them to the
+client as a Server-Timing header.
+"""
+
+import time
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.context import RequestContext, get_request_context
+from app.core.logging import get_logger, setup_logging
+
+setup_logging()
+logger = get_logger(__name__)
+
+
+class QueryStats:
+    def __init__(self, track_statements: bool = False):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Optional[Counter] = Counter() if track_statements else None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+        if self.statements is not None:
+            self.statements[statement] += 1
+
+
+class OperationMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.statements = 0
+        self.max_statements = 0
+        self.db_seconds_total = 0.0
+        self.db_seconds_max = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, stats: QueryStats) -> None:
+        self.requests += 1
+        self.statements += stats.count
+        self.max_statements = max(self.max_statements, stats.count)
+        self.db_seconds_total += stats.total_seconds
+        if stats.slowest_seconds > self.db_seconds_max:
+            self.db_seconds_max = stats.slowest_seconds
+            self.slowest_statement = stats.slowest_statement
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "avg_statements": self.statements / self.requests if self.requests else 0,
+            "max_statements": self.max_statements,
+            "avg_db_ms": (
+                self.db_seconds_total / self.requests * 1000 if self.requests else 0.0
+            ),
+            "slowest_statement_ms": self.db_seconds_max * 1000,
+            "slowest_statement": self.slowest_statement,
+        }
+
+
+operation_metrics: dict[str, OperationMetrics] = {}
+
+
+def get_operation_metrics() -> dict:
+    return {name: m.as_dict() for name, m in sorted(operation_metrics.items())}
+
+
+# ******** Engine hooks *******************************************************
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    ctx = get_request_context()
+    if ctx is not None and ctx.query_stats is not None:
+        ctx.query_stats.record(statement, elapsed)
+
+
+def install_query_instrumentation(engine: Engine) -> None:
+    """Attach the statement timing hooks to a (sync) engine."""
+    if not settings.ENABLE_SQL_INSTRUMENTATION:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ******** Middleware *********************************************************
+def _server_timing(stats: QueryStats) -> str:
+    return (
+        f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} statements", '
+        f"db-slowest;dur={stats.slowest_seconds * 1000:.1f}"
+    )
+
+
+class QueryInstrumentationMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Runs inside RequestContextMiddleware, which binds the context
+        ctx = get_request_context()
+        if ctx is None or not settings.ENABLE_SQL_INSTRUMENTATION:
+            await self.app(scope, receive, send)
+            return
+
+        ctx.query_stats = stats = QueryStats(
+            track_statements=settings.SQL_N_PLUS_ONE_THRESHOLD > 0
+        )
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", _server_timing(stats))
+            await send(message)
+
+        try:
+            await self.app(
+                scope,
+                receive,
+                send_with_timing if settings.SQL_SERVER_TIMING_HEADER else send,
+            )
+        finally:
+            ctx.query_stats = None
+            self.record(ctx, stats)
+
+    def record(self, ctx: RequestContext, stats: QueryStats) -> None:
+        operation_id = ctx.operation_id
+        if operation_id is None:
+            return
+        operation_metrics.setdefault(operation_id, OperationMetrics()).record(stats)
+
+        if stats.statements:
+            for statement, count in stats.statements.items():
+                if count >= settings.SQL_N_PLUS_ONE_THRESHOLD:
+                    logger.warning(
+                        "Possible N+1 in %s: statement ran %d times: %s",
+                        operation_id,
+                        count,
+                        statement,
+                    )
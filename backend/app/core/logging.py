@@ -1,31 +1,95 @@
+import atexit
+import json
 import logging
+import queue
+import random
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
 from app.core.config import settings
+from app.core.context import get_request_context
 
 log_level_str = settings.LOG_LEVEL.upper()
 log_level = getattr(logging, log_level_str, logging.WARNING)
 
+DEFAULT_FORMAT = (
+    "%(asctime)s [%(levelname)s] %(name)s - %(filename)s:%(lineno)d - %(message)s"
+)
+
+_listener: Optional[QueueListener] = None
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the request and operation they were logged from."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        ctx = get_request_context()
+        record.request_id = ctx.request_id if ctx else None
+        record.operation_id = ctx.operation_id if ctx else None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of the DEBUG records of chatty loggers.
+
+    ``rates`` maps a logger name (children included) to the fraction to keep.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or not self.rates:
+            return True
+        name = record.name
+        while name:
+            if name in self.rates:
+                return random.random() < self.rates[name]
+            name = name.rpartition(".")[0]
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "location": f"{record.filename}:{record.lineno}",
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "operation_id": getattr(record, "operation_id", None),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def stop_logging() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging(level=log_level, log_to_file=False, filename="app.log", force=False):
+    """Configure logging once; later calls are no-ops unless ``force`` is set.
+
+    Records are put on an in-memory queue by the calling thread and written by
+    a QueueListener thread, so handler I/O never runs on the event loop.
+    """
+    global _listener
+    if _listener is not None and not force:
+        return
+    stop_logging()
 
-def setup_logging(level=log_level, log_to_file=False, filename="app.log"):
     log_config = {
         "version": 1,
         "disable_existing_loggers": False,  # <== important!
-        "formatters": {
-            "default": {
-                "format": "%(asctime)s [%(levelname)s] %(name)s - %(filename)s:%(lineno)d - %(message)s",
-            },
-        },
-        "handlers": {
-            "default": {
-                "level": level,
-                "formatter": "default",
-                "class": "logging.StreamHandler",
-            },
-        },
         "loggers": {
             "": {  # root logger
-                "handlers": ["default"],
                 "level": level,
             },
             "uvicorn": {
@@ -36,7 +100,6 @@ def setup_logging(level=log_level, log_to_file=False, filename="app.log"):
             },
             "uvicorn.access": {
                 "level": level,
-                "handlers": ["default"],
                 "propagate": False,
             },
         },
@@ -44,6 +107,32 @@ def setup_logging(level=log_level, log_to_file=False, filename="app.log"):
 
     dictConfig(log_config)
 
+    output_handler = (
+        logging.FileHandler(filename) if log_to_file else logging.StreamHandler()
+    )
+    output_handler.setLevel(level)
+    if settings.LOG_FORMAT == "json":
+        output_handler.setFormatter(JSONFormatter())
+    else:
+        output_handler.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLING))
+    queue_handler.addFilter(RequestContextFilter())
+
+    for name in ("", "uvicorn.access"):
+        logger = logging.getLogger(name)
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, output_handler, respect_handler_level=True)
+    _listener.start()
+
+
+atexit.register(stop_logging)
+
 
 def get_logger(name=None):
     """Returns a logger for a module."""
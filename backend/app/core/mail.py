@@ -0,0 +1,226 @@
+"""Pooled, persistent SMTP connections."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from email.message import EmailMessage
+from typing import Optional
+
+import aiosmtplib
+
+from app.core.config import mail_settings
+from app.core.logging import get_logger, setup_logging
+
+setup_logging()
+logger = get_logger(__name__)
+
+# Errors after which a connection is dropped. A send is retried on a new
+# connection only if it failed before DATA, when nothing can have been delivered.
+RECONNECT_ERRORS = (aiosmtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+# The server refused a message; the connection is fine for the next one
+REFUSAL_ERRORS = (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPResponseException)
+
+
+class _SMTP(aiosmtplib.SMTP):
+    """Remember whether the current send has reached the DATA command."""
+
+    data_started = False
+
+    async def data(self, *args, **kwargs):
+        self.data_started = True
+        return await super().data(*args, **kwargs)
+
+
+def is_refusal(error: BaseException) -> bool:
+    # 421: the server is closing the connection
+    return isinstance(error, REFUSAL_ERRORS) and getattr(error, "code", None) != 421
+
+
+class PooledSMTP:
+    def __init__(self, client: aiosmtplib.SMTP):
+        self.client = client
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """Reuse authenticated SMTP sessions to one host.
+
+    At most ``max_connections`` sessions are open (and sending) at a time.
+    Idle sessions are kept for ``idle_timeout`` seconds and recycled after
+    ``max_messages_per_connection`` messages, as most servers cap both.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        start_tls: bool = True,
+        use_tls: bool = False,
+        timeout: float = 30,
+        max_connections: int = 4,
+        idle_timeout: float = 60,
+        max_messages_per_connection: int = 100,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_messages_per_connection = max_messages_per_connection
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._idle: list[PooledSMTP] = []
+        self.connects = 0
+        self.reconnects = 0
+        self.messages_sent = 0
+
+    async def _connect(self) -> PooledSMTP:
+        client = _SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        if self.username and self.password:
+            await client.login(self.username, self.password)
+        self.connects += 1
+        return PooledSMTP(client)
+
+    async def _discard(self, conn: PooledSMTP) -> None:
+        try:
+            await conn.client.quit()
+        except Exception:
+            conn.client.close()
+
+    async def _acquire(self) -> PooledSMTP:
+        while self._idle:
+            conn = self._idle.pop()
+            if (
+                conn.client.is_connected
+                and time.monotonic() - conn.last_used < self.idle_timeout
+            ):
+                return conn
+            await self._discard(conn)
+        return await self._connect()
+
+    def _release(self, conn: PooledSMTP) -> None:
+        conn.last_used = time.monotonic()
+        self._idle.append(conn)
+
+    @asynccontextmanager
+    async def session(self):
+        """Hold one pooled session, reconnecting if the server dropped it."""
+        async with self._semaphore:
+            session = _Session(self, await self._acquire())
+            try:
+                yield session
+            except BaseException as e:
+                if is_refusal(e):
+                    self._release(session.conn)
+                else:
+                    await self._discard(session.conn)
+                raise
+            else:
+                if session.conn.messages_sent >= self.max_messages_per_connection:
+                    await self._discard(session.conn)
+                else:
+                    self._release(session.conn)
+
+    async def send_message(self, message: EmailMessage) -> None:
+        async with self.session() as session:
+            await session.send(message)
+
+    async def send_messages(self, messages: list[EmailMessage]) -> None:
+        """Send a batch of messages over as few sessions as possible."""
+        async with self.session() as session:
+            for message in messages:
+                await session.send(message)
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._discard(self._idle.pop())
+
+    def stats(self) -> dict:
+        return {
+            "host": f"{self.hostname}:{self.port}",
+            "idle": len(self._idle),
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "messages_sent": self.messages_sent,
+        }
+
+
+class _Session:
+    def __init__(self, pool: SMTPConnectionPool, conn: PooledSMTP):
+        self.pool = pool
+        self.conn = conn
+
+    async def send(self, message: EmailMessage) -> None:
+        if self.conn.messages_sent >= self.pool.max_messages_per_connection:
+            await self._reconnect()
+        self.conn.client.data_started = False
+        try:
+            await self.conn.client.send_message(message)
+        except RECONNECT_ERRORS as e:
+            if self.conn.client.data_started:
+                # The server may have accepted the message; resending could
+                # deliver it twice
+                raise
+            logger.warning(
+                "SMTP session to %s lost (%s), reconnecting", self.pool.hostname, e
+            )
+            await self._reconnect()
+            await self.conn.client.send_message(message)
+        self.conn.messages_sent += 1
+        self.pool.messages_sent += 1
+
+    async def _reconnect(self) -> None:
+        await self.pool._discard(self.conn)
+        self.conn = await self.pool._connect()
+        self.pool.reconnects += 1
+
+
+_pools: dict[tuple[str, int, str], SMTPConnectionPool] = {}
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """The pool for the configured SMTP host, one per host/port/user."""
+    key = (
+        mail_settings.MAIL_SMTP_HOST,
+        mail_settings.MAIL_SMTP_PORT,
+        mail_settings.MAIL_SMTP_USERNAME,
+    )
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools[key] = SMTPConnectionPool(
+            hostname=mail_settings.MAIL_SMTP_HOST,
+            port=mail_settings.MAIL_SMTP_PORT,
+            username=mail_settings.MAIL_SMTP_USERNAME or None,
+            password=mail_settings.MAIL_SMTP_PASSWORD or None,
+            start_tls=mail_settings.MAIL_SMTP_START_TLS,
+            use_tls=mail_settings.MAIL_SMTP_USE_TLS,
+            timeout=mail_settings.MAIL_SMTP_TIMEOUT,
+            max_connections=mail_settings.MAIL_SMTP_POOL_SIZE,
+            idle_timeout=mail_settings.MAIL_SMTP_IDLE_TIMEOUT_SECONDS,
+            max_messages_per_connection=(
+                mail_settings.MAIL_SMTP_MAX_MESSAGES_PER_CONNECTION
+            ),
+        )
+    return pool
+
+
+async def close_smtp_pools() -> None:
+    for pool in _pools.values():
+        await pool.close()
+    _pools.clear()
+
+
+def get_smtp_pool_stats() -> list[dict]:
+    return [pool.stats() for pool in _pools.values()]
@@ -0,0 +1,91 @@
+"""Startup migrations that are cheap when current and safe across workers."""
+
+import fcntl
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import Connection, Engine, text
+
+from app.core.logging import get_logger, setup_logging
+
+setup_logging()
+logger = get_logger(__name__)
+
+ALEMBIC_CONFIG = "alembic.ini"
+# Arbitrary, app-wide key for pg_advisory_xact_lock
+MIGRATION_LOCK_KEY = 7_260_114_518
+
+
+def get_current_revision(conn: Connection) -> Optional[str]:
+    return MigrationContext.configure(conn).get_current_revision()
+
+
+@contextmanager
+def file_lock(path: str):
+    with open(path, "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@contextmanager
+def migration_lock(engine: Engine):
+    """Serialize migrations across workers and pods, yielding a connection.
+
+    Postgres holds a transaction-scoped advisory lock, SQLite a lock file next
+    to the database. Migrations run inside the yielded transaction.
+    """
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
+            yield conn
+    elif engine.dialect.name == "sqlite" and engine.url.database not in (
+        None,
+        "",
+        ":memory:",
+    ):
+        with file_lock(f"{engine.url.database}.migrate.lock"), engine.begin() as conn:
+            yield conn
+    else:
+        with engine.begin() as conn:
+            yield conn
+
+
+def run_startup_migrations(engine: Engine) -> None:
+    started = time.perf_counter()
+    config = Config(ALEMBIC_CONFIG)
+    head = ScriptDirectory.from_config(config).get_current_head()
+
+    # Fast path: nothing to do, no lock taken
+    with engine.connect() as conn:
+        current = get_current_revision(conn)
+    if current == head:
+        logger.info(
+            "DATABASE: at %s, migrations skipped (%.0f ms)",
+            head,
+            (time.perf_counter() - started) * 1000,
+        )
+        return
+
+    with migration_lock(engine) as conn:
+        # Another worker may have migrated while we waited for the lock
+        current = get_current_revision(conn)
+        if current != head:
+            logger.info("DATABASE: migrating %s -> %s", current, head)
+            if engine.dialect.name == "postgresql":
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+            config.attributes["connection"] = conn
+            command.upgrade(config, "head")
+
+    logger.info(
+        "DATABASE: migrations done (%.0f ms)", (time.perf_counter() - started) * 1000
+    )
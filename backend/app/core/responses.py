@@ -0,0 +1,75 @@
+"""JSON responses that skip FastAPI's jsonable_encoder pass.
+
+ORJSONResponse is the app's default response class. For routes returning
+a pydantic model, ``model_response`` validates (if needed) and dumps the
+model straight to bytes through a cached TypeAdapter; returning a Response
+makes FastAPI skip its own response_model serialization, while the route's
+``response_model`` still documents the schema.
+
+Routes with cheap validators set an ETag and answer a matching
+If-None-Match with 304 before building the body.
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+from app.core.serialization import dumps
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(tp: Any) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+def dump_model_json(tp: Any, content: Any) -> bytes:
+    adapter = get_type_adapter(tp)
+    if not (isinstance(tp, type) and isinstance(content, tp)):
+        content = adapter.validate_python(content, from_attributes=True)
+    return adapter.dump_json(content)
+
+
+def model_response(
+    tp: Any,
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    return Response(
+        dump_model_json(tp, content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+# ******** Conditional requests ***********************************************
+def make_etag(*parts: Any) -> str:
+    """A strong ETag from the values a representation is derived from."""
+    digest = hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(headers: Optional[Mapping[str, str]] = None) -> Response:
+    return Response(status_code=304, headers=headers)
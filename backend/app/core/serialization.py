@@ -0,0 +1,92 @@
+"""Fast JSON encoding and chunked streaming of large result sets."""
+
+from decimal import Decimal
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Literal, Optional
+
+import orjson
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+StreamFormat = Literal["json", "ndjson"]
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _default(obj: Any) -> Any:
+    # orjson handles UUID, datetime, date, enum and dataclasses natively
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+async def _aiter(records: Iterable | AsyncIterable) -> AsyncIterator:
+    if hasattr(records, "__aiter__"):
+        async for row in records:
+            yield row
+    else:
+        for row in records:
+            yield row
+
+
+async def stream_json(
+    records: Iterable | AsyncIterable,
+    format: StreamFormat = "json",
+    chunk_size: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """Encode records as one JSON array or as NDJSON, in chunks of ~chunk_size bytes.
+
+    Rows are pulled only when the previous chunk has been sent, so a server-side
+    cursor upstream is read at the pace of the client.
+    """
+    chunk_size = chunk_size or settings.STREAM_CHUNK_SIZE
+    array = format == "json"
+    buffer = bytearray(b"[" if array else b"")
+    first = True
+    async for row in _aiter(records):
+        if array:
+            if not first:
+                buffer += b","
+            first = False
+            buffer += dumps(row)
+        else:
+            buffer += dumps(row)
+            buffer += b"\n"
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if array:
+        buffer += b"]"
+    if buffer:
+        yield bytes(buffer)
+
+
+def json_streaming_response(
+    records: Iterable | AsyncIterable,
+    format: StreamFormat = "json",
+    chunk_size: Optional[int] = None,
+    filename: Optional[str] = None,
+) -> StreamingResponse:
+    headers = {}
+    if filename:
+        extension = "ndjson" if format == "ndjson" else "json"
+        headers["Content-Disposition"] = (
+            f'attachment; filename="{filename}.{extension}"'
+        )
+    return StreamingResponse(
+        stream_json(records, format=format, chunk_size=chunk_size),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
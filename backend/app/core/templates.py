@@ -0,0 +1,126 @@
+"""Email templates compiled once and rendered from cached parts.
+
+Templates use ``string.Template`` placeholders (``$name`` / ``${name}``).
+Fields known at startup, such as the brand name, are substituted when the
+template is registered; each template is then split into its static chunks
+and the per-recipient fields between them, so rendering is a single join.
+"""
+
+import html
+import string
+from typing import NamedTuple, Optional
+
+from app.core.config import settings
+
+
+class RenderedEmail(NamedTuple):
+    subject: str
+    text: str
+    html: str
+
+
+class CompiledTemplate:
+    """A template split into static parts around its remaining fields."""
+
+    def __init__(self, source: str, static: dict[str, str], escape: bool = False):
+        self.escape = escape
+        self.parts: list[str] = []
+        self.fields: list[str] = []
+        chunk, pos = [], 0
+        for match in string.Template.pattern.finditer(source):
+            chunk.append(source[pos : match.start()])
+            pos = match.end()
+            name = match.group("named") or match.group("braced")
+            if name is None:
+                # "$$" or a stray "$"
+                escaped = match.group("escaped") is not None
+                chunk.append("$" if escaped else match.group())
+            elif name in static:
+                chunk.append(html.escape(static[name]) if escape else static[name])
+            else:
+                self.parts.append("".join(chunk))
+                self.fields.append(name)
+                chunk = []
+        chunk.append(source[pos:])
+        self.parts.append("".join(chunk))
+
+    def render(self, fields: dict[str, object]) -> str:
+        out = [self.parts[0]]
+        for name, part in zip(self.fields, self.parts[1:]):
+            value = str(fields[name])
+            out.append(html.escape(value) if self.escape else value)
+            out.append(part)
+        return "".join(out)
+
+
+class EmailTemplate:
+    def __init__(self, subject: str, text: str, html: str, static: dict[str, str]):
+        self.subject = CompiledTemplate(subject, static)
+        self.text = CompiledTemplate(text, static)
+        self.html = CompiledTemplate(html, static, escape=True)
+        self.fields = set(self.subject.fields + self.text.fields + self.html.fields)
+
+    def render(self, **fields) -> RenderedEmail:
+        missing = self.fields - fields.keys()
+        if missing:
+            raise KeyError(f"Missing template fields: {', '.join(sorted(missing))}")
+        return RenderedEmail(
+            subject=self.subject.render(fields),
+            text=self.text.render(fields),
+            html=self.html.render(fields),
+        )
+
+
+class TemplateRegistry:
+    """Email templates by name and locale, falling back to the default locale."""
+
+    def __init__(self, default_locale: str, static: dict[str, str]):
+        self.default_locale = default_locale
+        self.static = static
+        self._templates: dict[tuple[str, str], EmailTemplate] = {}
+
+    def register(
+        self, name: str, locale: str, subject: str, text: str, html: str
+    ) -> None:
+        self._templates[(name, locale)] = EmailTemplate(
+            subject, text, html, self.static
+        )
+
+    def get(self, name: str, locale: Optional[str] = None) -> EmailTemplate:
+        template = self._templates.get((name, locale or self.default_locale))
+        if template is None:
+            template = self._templates[(name, self.default_locale)]
+        return template
+
+    def render(
+        self, name: str, locale: Optional[str] = None, **fields
+    ) -> RenderedEmail:
+        return self.get(name, locale).render(**fields)
+
+
+def negotiate_locale(accept_language: Optional[str]) -> str:
+    """Pick the best supported locale from an Accept-Language header."""
+    if not accept_language:
+        return settings.DEFAULT_LOCALE
+    candidates = []
+    for item in accept_language.split(","):
+        tag, _, params = item.strip().partition(";")
+        params = params.strip()
+        try:
+            quality = float(params[2:]) if params.startswith("q=") else 1
+        except ValueError:
+            continue
+        candidates.append((quality, tag.strip().lower()))
+    for quality, tag in sorted(candidates, key=lambda c: -c[0]):
+        if quality <= 0:
+            continue
+        language = tag.split("-")[0]
+        if language in settings.SUPPORTED_LOCALES:
+            return language
+    return settings.DEFAULT_LOCALE
+
+
+email_templates = TemplateRegistry(
+    default_locale=settings.DEFAULT_LOCALE,
+    static={"brand_name": settings.BRAND_NAME, "app_url": settings.APP_URL},
+)
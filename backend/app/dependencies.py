@@ -3,10 +3,10 @@ from typing import Optional
 from fastapi import Depends, Header, Request
 from fastapi.security.utils import get_authorization_scheme_param
 from jose import JWTError
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.accounts.models import Account
-from app.accounts.services import get_account_by_email
+from app.accounts.models import AccountPrincipal
+from app.accounts.services import get_account_principal_by_email
 from app.auth.models import TokenPayload
 from app.auth.services.jwt import verify_access_token
 from app.core.config import settings
@@ -14,8 +14,10 @@ from app.core.database import get_db
 from app.core.exceptions import (
     AccountDisabledException,
     CredentialsValidationFailureException,
+    InsufficientPermissionsException,
 )
 from app.core.logging import get_logger, setup_logging
+from app.core.templates import negotiate_locale
 
 setup_logging()
 logger = get_logger(__name__)
@@ -30,7 +32,9 @@ async def get_optional_token(request: Request) -> Optional[str]:
     return None
 
 
-async def get_current_account_with_token(token: str, db: Session) -> Account:
+async def get_current_account_with_token(
+    token: str, db: AsyncSession
+) -> AccountPrincipal:
     logger.debug("get_current_account_with_token")
     try:
         # Decode and validate the token (both signature and expiration)
@@ -43,8 +47,8 @@ async def get_current_account_with_token(token: str, db: Session) -> Account:
     except JWTError:
         raise CredentialsValidationFailureException
 
-    # Retrieve account by email
-    account = get_account_by_email(db=db, email=email)
+    # Retrieve account by email, served from the principal cache when possible
+    account = await get_account_principal_by_email(db=db, email=email)
     if account is None:
         logger.debug("get_current_account_with_token: account is None")
         raise CredentialsValidationFailureException
@@ -52,7 +56,7 @@ async def get_current_account_with_token(token: str, db: Session) -> Account:
     return account
 
 
-async def get_current_account_with_api_key(x_api_key: str, db: Session):
+async def get_current_account_with_api_key(x_api_key: str, db: AsyncSession):
     logger.debug("get_current_account_with_api_key")
     account = None
     if settings.ENABLE_SERVICE_ACCOUNT_AUTH and x_api_key:
@@ -70,8 +74,8 @@ async def get_current_account_with_api_key(x_api_key: str, db: Session):
 async def get_current_account(
     token: Optional[str] = Depends(get_optional_token),
     x_api_key: Optional[str] = Header(default=None, alias=settings.API_KEY_HEADER),
-    db: Session = Depends(get_db),
-) -> Account:
+    db: AsyncSession = Depends(get_db),
+) -> AccountPrincipal:
     logger.debug("get_current_account")
 
     if token:
@@ -83,12 +87,29 @@ async def get_current_account(
 
 
 async def get_current_active_account(
-    current_account: Account = Depends(get_current_account),
-) -> Account:
+    current_account: AccountPrincipal = Depends(get_current_account),
+) -> AccountPrincipal:
     logger.debug("get_current_active_account")
-    current_active_account = await current_account
-    if current_active_account is None:
+    if current_account is None:
         raise CredentialsValidationFailureException
-    if current_active_account.disabled:
+    if current_account.disabled:
         raise AccountDisabledException
-    return current_active_account
+    return current_account
+
+
+async def get_current_admin_account(
+    current_account: AccountPrincipal = Depends(get_current_active_account),
+) -> AccountPrincipal:
+    logger.debug("get_current_admin_account")
+    if not is_admin_account(current_account):
+        raise InsufficientPermissionsException
+    return current_account
+
+
+def is_admin_account(account: AccountPrincipal) -> bool:
+    return account.email in [e.lower() for e in settings.ADMIN_EMAILS]
+
+
+async def get_locale(accept_language: Optional[str] = Header(default=None)) -> str:
+    """Locale for emails sent on behalf of this request."""
+    return negotiate_locale(accept_language)
@@ -2,18 +2,26 @@ import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from fastapi.middleware.gzip import GZipMiddleware
 
 # Middlewares
-from sqlmodel import create_engine, text
 from starlette.middleware.cors import CORSMiddleware
 
 # Endpoints
 from app._api.v1 import accounts as account_endpoints_v1
+from app._api.v1 import debug as debug_endpoints_v1
+from app._api.v1 import tiles as tile_endpoints_v1
+from app.auth.services.security import shutdown_hash_executor
 
 # Core
-from app.core.config import secret_settings, settings
-from app.utils import run_alembic_migration, set_operation_ids
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.context import RequestContextMiddleware
+from app.core.database import async_engine, engine
+from app.core.instrumentation import QueryInstrumentationMiddleware
+from app.core.mail import close_smtp_pools
+from app.core.migrations import run_startup_migrations
+from app.core.responses import ORJSONResponse
+from app.utils import set_operation_ids
 
 # from app.core.logging import get_logger, setup_logging
 
@@ -31,28 +39,40 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     logger.info("Running startup events...")
 
-    logger.info("DATABASE: Create postgis extension")
-    with create_engine(
-        secret_settings.SQLALCHEMY_DATABASE_URI, isolation_level="AUTOCOMMIT"
-    ).connect() as conn:
-        conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
-
     logger.info("DATABASE: Run alembic migrations")
-    run_alembic_migration(secret_settings.SQLALCHEMY_DATABASE_URI)
+    run_startup_migrations(engine)
 
     yield
 
+    shutdown_hash_executor()
+    await close_smtp_pools()
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# GZIP middleware
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# zstd / br / gzip, negotiated per request
+app.add_middleware(
+    CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE
+)
+
+# Per-request SQL statement count and timing, per-operation metrics and an
+# opt-in Server-Timing header
+app.add_middleware(QueryInstrumentationMiddleware)
+
+# Request id and operation id for logs and instrumentation. Added last so it
+# wraps the middlewares above.
+app.add_middleware(RequestContextMiddleware)
 
 # Include the authentication and users routers
 app.include_router(account_endpoints_v1.router)
+app.include_router(tile_endpoints_v1.router)
+if settings.ENABLE_DEBUG_ENDPOINTS:
+    app.include_router(debug_endpoints_v1.router)
 # app.include_router(users_endpoints_v1.router)
 
 # # Include more routers
@@ -73,8 +93,8 @@ if settings.all_cors_origins:
 # Set operation_ids after adding all routes
 set_operation_ids(app)
 
-logger.info(f"BACKEND_CORS_ORIGINS={settings.BACKEND_CORS_ORIGINS}")
-logger.info(f"FRONTEND_HOST={settings.FRONTEND_HOST}")
+logger.info("BACKEND_CORS_ORIGINS=%s", settings.BACKEND_CORS_ORIGINS)
+logger.info("FRONTEND_HOST=%s", settings.FRONTEND_HOST)
 
 
 @app.get("/health", tags=["Default"])
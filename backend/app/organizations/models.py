@@ -1,7 +1,7 @@
 # Database SQLModel
 
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
 from sqlmodel import TIMESTAMP, Column, Field, Relationship, SQLModel, UniqueConstraint
@@ -11,7 +11,8 @@ if TYPE_CHECKING:
     from app.projects.models import Project
 
 from app.projects.models import ProjectPublic
-from app.utils import generate_public_id
+from app.core.clock import utc_now
+from app.core.ids import generate_public_id, uuid7
 
 
 class OrganizationBase(SQLModel):
@@ -20,7 +21,7 @@ class OrganizationBase(SQLModel):
         unique=True,
         index=True,
     )
-    name: str = Field(index=True)
+    name: str
     description: Optional[str]
     is_default_org: Optional[bool] = False
 
@@ -31,8 +32,8 @@ class Organization(OrganizationBase, table=True):
         UniqueConstraint("account_id", "name", name=f"uq_{__tablename__}_owner_name"),
     )
 
-    id: Optional[int] = Field(default=None, primary_key=True, index=True)
-    uid: uuid.UUID = Field(default_factory=uuid.uuid4, unique=True, index=True)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    uid: uuid.UUID = Field(default_factory=uuid7, unique=True, index=True)
 
     # Account owner
     account_id: int = Field(
@@ -45,10 +46,10 @@ class Organization(OrganizationBase, table=True):
     # List of projects within this organization
     projects: list["Project"] = Relationship(back_populates="organization")
 
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utc_now)
     updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(TIMESTAMP, onupdate=datetime.now(timezone.utc)),
+        default_factory=utc_now,
+        sa_column=Column(TIMESTAMP, onupdate=utc_now),
     )
 
 
@@ -0,0 +1,48 @@
+import enum
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import JSON, Column, Enum, Field, Index, SQLModel
+
+from app.core.clock import utc_now
+
+
+class EmailKind(str, enum.Enum):
+    WELCOME = "welcome"
+    PASSWORD_RESET = "password_reset"
+    PASSWORD_RESET_SUCCEED = "password_reset_succeed"
+
+
+class OutboxStatus(enum.Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class EmailOutbox(SQLModel, table=True):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Claim order of the worker: due pending rows first
+        Index(
+            f"ix_{__tablename__}_status_next_attempt_at", "status", "next_attempt_at"
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str
+    recipient: str
+    # Keyword arguments of the email function. References only, never secrets
+    # such as tokens: they are minted at send time. Cleared once delivered.
+    payload: dict = Field(default_factory=dict, sa_column=Column(JSON))
+    status: OutboxStatus = Field(
+        sa_column=Column(Enum(OutboxStatus), nullable=False),
+        default=OutboxStatus.PENDING,
+    )
+    attempts: int = 0
+    last_error: Optional[str] = None
+
+    next_attempt_at: datetime = Field(default_factory=utc_now)
+    claimed_at: Optional[datetime] = None
+    sent_at: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=utc_now)
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from sqlalchemy import and_, or_, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.clock import utc_now
+from app.core.config import mail_settings
+from app.core.logging import get_logger, setup_logging
+from app.outbox.models import EmailKind, EmailOutbox, OutboxStatus
+
+setup_logging()
+logger = get_logger(__name__)
+
+
+def enqueue_email(
+    db: AsyncSession, kind: EmailKind, recipient: str, **payload
+) -> EmailOutbox:
+    """Add an email to the outbox of the current transaction.
+
+    Nothing is sent until the caller commits, so the email is written if and
+    only if the change that triggered it is.
+    """
+    message = EmailOutbox(kind=kind.value, recipient=recipient, payload=payload)
+    db.add(message)
+    return message
+
+
+async def claim_email_batch(db: AsyncSession, batch_size: int) -> list[EmailOutbox]:
+    """Claim due messages; concurrent workers skip each other's rows."""
+    now = utc_now()
+    stale = now - timedelta(seconds=mail_settings.OUTBOX_CLAIM_TIMEOUT_SECONDS)
+    query = (
+        select(EmailOutbox)
+        .where(
+            or_(
+                and_(
+                    EmailOutbox.status == OutboxStatus.PENDING,
+                    EmailOutbox.next_attempt_at <= now,
+                ),
+                # Claimed by a worker that died before recording the result
+                and_(
+                    EmailOutbox.status == OutboxStatus.SENDING,
+                    EmailOutbox.claimed_at < stale,
+                ),
+            )
+        )
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    async with db.begin():
+        messages = (await db.exec(query)).all()
+        for message in messages:
+            message.status = OutboxStatus.SENDING
+            message.claimed_at = now
+            message.attempts += 1
+    return messages
+
+
+async def record_email_results(
+    db: AsyncSession, results: list[tuple[EmailOutbox, Exception | None]]
+) -> None:
+    now = utc_now()
+    async with db.begin():
+        for message, error in results:
+            if error is None:
+                values = dict(
+                    status=OutboxStatus.SENT, sent_at=now, last_error=None, payload={}
+                )
+            elif message.attempts >= mail_settings.OUTBOX_MAX_ATTEMPTS:
+                logger.error(
+                    "Email %d to %s failed for good: %s",
+                    message.id,
+                    message.recipient,
+                    error,
+                )
+                values = dict(
+                    status=OutboxStatus.FAILED, last_error=str(error), payload={}
+                )
+            else:
+                backoff = min(
+                    mail_settings.OUTBOX_BACKOFF_BASE_SECONDS
+                    * 2 ** (message.attempts - 1),
+                    mail_settings.OUTBOX_BACKOFF_MAX_SECONDS,
+                )
+                values = dict(
+                    status=OutboxStatus.PENDING,
+                    next_attempt_at=now + timedelta(seconds=backoff),
+                    last_error=str(error),
+                )
+            await db.exec(
+                update(EmailOutbox).where(EmailOutbox.id == message.id).values(**values)
+            )
@@ -0,0 +1,123 @@
+"""Deliver queued emails from the outbox.
+
+Run one or more workers next to the API, e.g.
+
+    python -m app.outbox.worker --concurrency 8
+
+Workers claim batches with SELECT ... FOR UPDATE SKIP LOCKED, so any number
+of them can poll the same table without sending a message twice.
+"""
+
+import argparse
+import asyncio
+from typing import Awaitable, Callable
+
+from app.accounts.emails import (
+    send_password_reset_link,
+    send_password_reset_succeed_email,
+    send_welcome_email,
+)
+from app.core.config import mail_settings
+from app.core.database import async_engine, async_session_factory
+from app.core.logging import get_logger, setup_logging
+from app.core.mail import close_smtp_pools
+from app.outbox.models import EmailKind, EmailOutbox
+from app.outbox.services import claim_email_batch, record_email_results
+
+setup_logging()
+logger = get_logger(__name__)
+
+EMAIL_SENDERS: dict[str, Callable[..., Awaitable[None]]] = {
+    EmailKind.WELCOME.value: send_welcome_email,
+    EmailKind.PASSWORD_RESET.value: send_password_reset_link,
+    EmailKind.PASSWORD_RESET_SUCCEED.value: send_password_reset_succeed_email,
+}
+
+
+async def deliver(
+    message: EmailOutbox, semaphore: asyncio.Semaphore
+) -> Exception | None:
+    async with semaphore:
+        try:
+            sender = EMAIL_SENDERS[message.kind]
+            await sender(message.recipient, **message.payload)
+        except Exception as e:
+            logger.warning(
+                "Email %d (%s) attempt %d failed: %s",
+                message.id,
+                message.kind,
+                message.attempts,
+                e,
+            )
+            return e
+    return None
+
+
+async def process_batch(batch_size: int, semaphore: asyncio.Semaphore) -> int:
+    """Claim, send and record one batch; returns the number of messages."""
+    async with async_session_factory() as db:
+        messages = await claim_email_batch(db, batch_size)
+    if not messages:
+        return 0
+
+    errors = await asyncio.gather(*(deliver(m, semaphore) for m in messages))
+
+    async with async_session_factory() as db:
+        await record_email_results(db, list(zip(messages, errors)))
+    logger.info(
+        "OUTBOX: %d sent, %d failed",
+        errors.count(None),
+        len(errors) - errors.count(None),
+    )
+    return len(messages)
+
+
+async def run_worker(
+    batch_size: int, concurrency: int, poll_interval: float, once: bool = False
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    try:
+        while True:
+            try:
+                processed = await process_batch(batch_size, semaphore)
+            except Exception:
+                logger.exception("OUTBOX: batch failed")
+                processed = 0
+            if once and processed < batch_size:
+                return
+            # Drain back to back while there is work, poll when idle
+            if processed < batch_size:
+                await asyncio.sleep(poll_interval)
+    finally:
+        await close_smtp_pools()
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--batch-size", type=int, default=mail_settings.OUTBOX_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=mail_settings.OUTBOX_CONCURRENCY
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=mail_settings.OUTBOX_POLL_INTERVAL_SECONDS,
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="Exit once no message is due"
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(
+            run_worker(args.batch_size, args.concurrency, args.poll_interval, args.once)
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
 from sqlmodel import TIMESTAMP, Column, Field, Relationship, SQLModel, UniqueConstraint
@@ -7,7 +7,8 @@ from sqlmodel import TIMESTAMP, Column, Field, Relationship, SQLModel, UniqueCon
 if TYPE_CHECKING:
     from app.organizations.models import Organization
 
-from app.utils import generate_public_id
+from app.core.clock import utc_now
+from app.core.ids import generate_public_id, uuid7
 
 
 class ProjectBase(SQLModel):
@@ -16,7 +17,7 @@ class ProjectBase(SQLModel):
         unique=True,
         index=True,
     )
-    name: str = Field(index=True)
+    name: str
     description: Optional[str]
     is_default_project: Optional[bool] = False
 
@@ -29,17 +30,17 @@ class Project(ProjectBase, table=True):
         ),
     )
 
-    id: Optional[int] = Field(default=None, primary_key=True, index=True)
-    uid: uuid.UUID = Field(default_factory=uuid.uuid4, unique=True, index=True)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    uid: uuid.UUID = Field(default_factory=uuid7, unique=True, index=True)
 
     # Parent organization of this project
     organization_id: int = Field(foreign_key="organization.id")
     organization: Optional["Organization"] = Relationship(back_populates="projects")
 
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utc_now)
     updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(TIMESTAMP, onupdate=datetime.now(timezone.utc)),
+        default_factory=utc_now,
+        sa_column=Column(TIMESTAMP, onupdate=utc_now),
     )
 
 
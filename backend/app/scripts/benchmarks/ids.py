@@ -0,0 +1,115 @@
+"""Benchmark inserts keyed by random vs time-ordered identifiers.
+
+For each scheme, inserts --rows rows into a scratch table with a unique
+index on the key: uuid4 vs UUIDv7 uids, and secrets.choice vs k-sortable
+base62 public ids. Reports generation cost, insert throughput overall and
+for the last batch (once the index outgrows the cache, random keys slow
+down first) and, on Postgres, the index size. Scratch tables are dropped
+afterwards.
+
+Usage:
+    python -m app.scripts.benchmarks.ids [--rows 200000] [--batch-size 5000]
+"""
+
+import argparse
+import secrets
+import string
+import time
+import uuid
+from typing import Optional
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Uuid,
+    insert,
+    text,
+)
+
+from app.core.database import engine
+from app.core.ids import generate_public_id, uuid7
+
+
+def legacy_public_id(prefix="org", random_length=16):
+    """generate_public_id before time-ordered ids."""
+    alphabet = string.ascii_letters + string.digits
+    random_part = "".join(secrets.choice(alphabet) for _ in range(random_length))
+    return f"{prefix}-{random_part}"
+
+
+SCHEMES = {
+    "uid_uuid4": (Uuid, uuid.uuid4),
+    "uid_uuid7": (Uuid, uuid7),
+    "public_id_random": (String, legacy_public_id),
+    "public_id_sortable": (String, generate_public_id),
+}
+
+
+def index_size(conn: Connection, index_name: str) -> Optional[int]:
+    if conn.dialect.name != "postgresql":
+        return None
+    return conn.execute(
+        text("SELECT pg_relation_size(CAST(:name AS regclass))"), {"name": index_name}
+    ).scalar_one()
+
+
+def run(name: str, column_type, generate, rows: int, batch_size: int) -> None:
+    metadata = MetaData()
+    index_name = f"ix_bench_ids_{name}_key"
+    table = Table(
+        f"bench_ids_{name}",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("key", column_type, nullable=False),
+        Index(index_name, "key", unique=True),
+    )
+    metadata.create_all(engine)
+    try:
+        generate_seconds = insert_seconds = last_batch_seconds = 0.0
+        for start in range(0, rows, batch_size):
+            started = time.perf_counter()
+            batch = [
+                {"key": generate()} for _ in range(min(batch_size, rows - start))
+            ]
+            generated = time.perf_counter()
+            with engine.begin() as conn:
+                conn.execute(insert(table), batch)
+            last_batch_seconds = time.perf_counter() - generated
+            generate_seconds += generated - started
+            insert_seconds += last_batch_seconds
+
+        with engine.connect() as conn:
+            size = index_size(conn, index_name)
+        last_batch = rows - (rows - 1) // batch_size * batch_size
+        print(
+            f"{name:<20} gen {generate_seconds / rows * 1e6:6.2f} us/id  "
+            f"insert {rows / insert_seconds:9.0f} rows/s  "
+            f"last batch {last_batch / last_batch_seconds:9.0f} rows/s"
+            + (f"  index {size / 2**20:8.1f} MiB" if size is not None else "")
+        )
+    finally:
+        metadata.drop_all(engine)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument(
+        "--scheme", choices=SCHEMES, action="append", help="default: all"
+    )
+    args = parser.parse_args()
+
+    print(f"{engine.dialect.name}, {args.rows} rows in batches of {args.batch_size}")
+    for name in args.scheme or SCHEMES:
+        column_type, generate = SCHEMES[name]
+        run(name, column_type, generate, args.rows, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark response serialization of the account endpoints' models.
+
+Compares, per response, the stdlib path FastAPI used before (model_dump,
+jsonable_encoder, json.dumps), the same path through ORJSONResponse, and
+dumping the validated model straight to bytes with a cached TypeAdapter.
+No database is needed; payloads are built in memory.
+
+Usage:
+    python -m app.scripts.benchmarks.serialization [--orgs 5] [--projects 10] [--number 2000]
+"""
+
+import argparse
+import json
+import timeit
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from app.accounts.models import AccountListItem, AccountPage, AccountProfileMe
+from app.core.responses import ORJSONResponse, dump_model_json, get_type_adapter
+from app.organizations.models import OrganizationPublic
+from app.projects.models import ProjectPublic
+
+
+def build_profile(orgs: int, projects: int) -> AccountProfileMe:
+    now = datetime.now(timezone.utc)
+    return AccountProfileMe(
+        uid=uuid.uuid4(),
+        email="bench@example.com",
+        disabled=False,
+        full_name="Bench Mark",
+        organizations=[
+            OrganizationPublic(
+                uid=uuid.uuid4(),
+                public_id=f"org-{i:016d}",
+                name=f"Org {i}",
+                description="Benchmark organization",
+                projects=[
+                    ProjectPublic(
+                        uid=uuid.uuid4(),
+                        public_id=f"project-{i:08d}{j:08d}",
+                        name=f"Project {j}",
+                        description="Benchmark project",
+                    )
+                    for j in range(projects)
+                ],
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(orgs)
+        ],
+        created_at=now.isoformat(),
+        updated_at=now.isoformat(),
+    )
+
+
+def build_page(items: int) -> AccountPage:
+    now = datetime.now(timezone.utc)
+    return AccountPage(
+        items=[
+            AccountListItem(
+                id=i,
+                uid=uuid.uuid4(),
+                email=f"bench-{i}@example.com",
+                disabled=False,
+                created_at=now,
+            )
+            for i in range(items)
+        ],
+        next_cursor="bench",
+    )
+
+
+def legacy_json(tp, content) -> bytes:
+    """FastAPI's response_model path with the stock JSONResponse."""
+    validated = get_type_adapter(tp).validate_python(
+        content.model_dump(by_alias=True), from_attributes=True
+    )
+    return json.dumps(
+        jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def legacy_orjson(tp, content) -> bytes:
+    """The same path, rendered by ORJSONResponse."""
+    validated = get_type_adapter(tp).validate_python(
+        content.model_dump(by_alias=True), from_attributes=True
+    )
+    return ORJSONResponse(jsonable_encoder(validated)).body
+
+
+def bench(label: str, func, number: int) -> float:
+    func()  # warm caches
+    seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+    print(f"  {label:<36} {seconds * 1e6:10.1f} us")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orgs", type=int, default=5)
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument("--items", type=int, default=100, help="accounts per page")
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    cases = [
+        (
+            f"GET /profile/me ({args.orgs} orgs x {args.projects} projects)",
+            AccountProfileMe,
+            build_profile(args.orgs, args.projects),
+        ),
+        (f"GET /accounts ({args.items} items)", AccountPage, build_page(args.items)),
+    ]
+    for title, tp, content in cases:
+        print(f"{title}, {len(dump_model_json(tp, content))} bytes")
+        before = bench(
+            "jsonable_encoder + json.dumps",
+            lambda: legacy_json(tp, content),
+            args.number,
+        )
+        bench(
+            "jsonable_encoder + orjson", lambda: legacy_orjson(tp, content), args.number
+        )
+        after = bench(
+            "cached TypeAdapter.dump_json",
+            lambda: dump_model_json(tp, content),
+            args.number,
+        )
+        print(f"  speedup {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark signups/sec of create_account against the configured database.
+
+Compares the current create_account with the previous check-then-insert ORM
+flow. Pass --skip-hash to take bcrypt out of the measurement and compare the
+database paths only.
+
+Usage:
+    python -m app.scripts.benchmarks.signup [--count 500] [--concurrency 20] [--skip-hash]
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.accounts import services
+from app.accounts.models import Account, AccountCreate, AccountProfile
+from app.core.database import async_engine, async_session_factory
+from app.core.exceptions import EmailAlreadyExistsException
+from app.organizations.models import Organization
+from app.projects.models import Project
+
+
+async def legacy_create_account(db: AsyncSession, account: AccountCreate) -> Account:
+    """The create_account flow before the single-transaction rewrite."""
+    async with db.begin():
+        if await services.get_account_by_email(db, account.email):
+            raise EmailAlreadyExistsException
+        hashed_password = await services.get_password_hash_async(account.password)
+        db_account = Account(
+            email=account.email.lower(),
+            hashed_password=hashed_password,
+            disabled=account.disabled,
+            account_type=account.account_type,
+            uid=uuid.uuid4(),
+        )
+        db.add(db_account)
+        db.add(AccountProfile(account=db_account, full_name=account.full_name))
+        db_org = Organization(
+            account=db_account,
+            name="Default org",
+            description="Default organization",
+            is_default_org=True,
+        )
+        db.add(db_org)
+        db.add(
+            Project(
+                organization=db_org,
+                name="Default project",
+                description="Default project",
+                is_default_project=True,
+            )
+        )
+    return db_account
+
+
+async def run(create, count: int, concurrency: int, label: str) -> float:
+    run_id = uuid.uuid4().hex[:8]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def signup(i: int):
+        async with semaphore, async_session_factory() as db:
+            await create(
+                db,
+                AccountCreate(
+                    email=f"bench-{label}-{run_id}-{i}@example.com",
+                    full_name=f"Bench {i}",
+                    password="Benchmark123",
+                ),
+            )
+
+    started = time.perf_counter()
+    await asyncio.gather(*(signup(i) for i in range(count)))
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed
+    print(f"{label:>8}: {count} signups in {elapsed:.2f}s -> {rate:.1f} signups/s")
+    return rate
+
+
+async def main(count: int, concurrency: int, skip_hash: bool) -> None:
+    if skip_hash:
+
+        async def fake_hash(password: str) -> str:
+            return "benchmark"
+
+        services.get_password_hash_async = fake_hash
+
+    before = await run(legacy_create_account, count, concurrency, "before")
+    after = await run(services.create_account, count, concurrency, "after")
+    print(f" speedup: {after / before:.2f}x")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--skip-hash", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.count, args.concurrency, args.skip_hash))
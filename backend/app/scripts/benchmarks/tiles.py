@@ -0,0 +1,195 @@
+"""Benchmark tile rendering against dataset size (PostgreSQL + PostGIS).
+
+For each size, fills a scratch table with random points or polygons in
+EPSG:4326 and a GIST index on geom (as ogr2ogr loads datasets), then renders
+the same random tiles per zoom with:
+
+- legacy: get_dataset_tile before geom_3857, ST_Transform(geom) in the filter
+- fallback: get_dataset_tile on the table as loaded
+- indexed: after app.tiles.ingest.add_web_mercator_geometry
+- pyramid: after app.tiles.ingest.build_zoom_pyramid (zoom 0-6 only)
+
+and reports the median render time and tile size. Scratch objects are
+dropped afterwards.
+
+Usage:
+    python -m app.scripts.benchmarks.tiles [--sizes 10000 100000 1000000]
+        [--zooms 2 5 8 12] [--tiles 20] [--geometry point|polygon]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import Connection, text
+
+from app.core.database import engine
+from app.tiles.ingest import (
+    PYRAMID_MAX_ZOOMS,
+    add_web_mercator_geometry,
+    build_zoom_pyramid,
+    pyramid_table_name,
+)
+
+GEOMETRIES = {
+    "point": "ST_SetSRID(ST_MakePoint(random() * 360 - 180, random() * 170 - 85), "
+    "4326)",
+    # ~64-vertex polygons up to 0.5 degrees across
+    "polygon": "ST_Buffer(ST_SetSRID(ST_MakePoint(random() * 359 - 179.5, "
+    "random() * 169 - 84.5), 4326), random() * 0.25, 16)",
+}
+
+LEGACY_FUNCTION = r"""
+CREATE OR REPLACE FUNCTION bench_legacy_dataset_tile(
+    relation text,
+    primary_key_column text,
+    z integer,
+    x integer,
+    y integer
+) RETURNS bytea
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    tile bytea;
+BEGIN
+    EXECUTE format(
+        $f$
+        WITH mvtgeom AS (
+            SELECT ST_AsMVTGeom(
+                       ST_Transform(geom, 3857),
+                       ST_TileEnvelope(%s, %s, %s),
+                       4096,
+                       0,
+                       true
+                   ) AS geom
+            ,%s AS id
+            ,*
+            FROM %s
+            WHERE ST_Intersects(
+                ST_Transform(geom, 3857),
+                ST_TileEnvelope(%s, %s, %s)
+            )
+        )
+        SELECT ST_AsMVT(mvtgeom, 'dataset', 4096, 'geom', 'id') FROM mvtgeom
+        $f$,
+        z, x, y,
+        primary_key_column,
+        quote_ident(relation),
+        z, x, y
+    ) INTO tile;
+    RETURN tile;
+END;
+$$
+"""
+
+
+def create_dataset(conn: Connection, relation: str, size: int, geometry: str) -> None:
+    conn.execute(text("SELECT setseed(0.42)"))
+    conn.execute(
+        text(
+            f"CREATE TABLE {relation} AS "
+            "SELECT g AS id, 'feature ' || g AS name, random() AS value, "
+            f"{GEOMETRIES[geometry]} AS geom "
+            "FROM generate_series(1, :size) AS g"
+        ),
+        {"size": size},
+    )
+    conn.execute(text(f"ALTER TABLE {relation} ADD PRIMARY KEY (id)"))
+    conn.execute(text(f"CREATE INDEX ON {relation} USING GIST (geom)"))
+    conn.execute(text(f"ANALYZE {relation}"))
+
+
+def render(
+    conn: Connection, function: str, relation: str, tiles: list[tuple[int, int, int]]
+) -> tuple[float, float]:
+    """Median render time in ms and tile size in KiB."""
+    query = text(f"SELECT {function}(:relation, 'id', :z, :x, :y)")
+    timings = []
+    sizes = []
+    for z, x, y in tiles:
+        started = time.perf_counter()
+        tile = conn.execute(
+            query, {"relation": relation, "z": z, "x": x, "y": y}
+        ).scalar_one()
+        timings.append((time.perf_counter() - started) * 1000)
+        sizes.append(len(tile or b"") / 1024)
+    return statistics.median(timings), statistics.median(sizes)
+
+
+def render_all(
+    function: str, relation: str, tiles: dict[int, list]
+) -> dict[int, tuple[float, float]]:
+    with engine.connect() as conn:
+        return {z: render(conn, function, relation, tiles[z]) for z in tiles}
+
+
+def run(size: int, zooms: list[int], tile_count: int, geometry: str) -> None:
+    relation = f"bench_tiles_{size}"
+    rng = random.Random(size)
+    tiles = {
+        z: [
+            (z, rng.randrange(1 << z), rng.randrange(1 << z))
+            for _ in range(tile_count)
+        ]
+        for z in zooms
+    }
+    try:
+        with engine.begin() as conn:
+            create_dataset(conn, relation, size, geometry)
+        stages = {
+            "legacy": render_all("bench_legacy_dataset_tile", relation, tiles),
+            "fallback": render_all("get_dataset_tile", relation, tiles),
+        }
+        add_web_mercator_geometry(engine, relation)
+        stages["indexed"] = render_all("get_dataset_tile", relation, tiles)
+        build_zoom_pyramid(engine, relation)
+        stages["pyramid"] = render_all("get_dataset_tile", relation, tiles)
+
+        for z in zooms:
+            print(
+                f"{size:>9} rows  z{z:<3}"
+                + "".join(
+                    f"  {name} {results[z][0]:8.2f} ms {results[z][1]:8.1f} KiB"
+                    for name, results in stages.items()
+                )
+            )
+    finally:
+        with engine.begin() as conn:
+            for max_zoom in PYRAMID_MAX_ZOOMS:
+                level = pyramid_table_name(relation, max_zoom)
+                conn.execute(text(f"DROP TABLE IF EXISTS {level}"))
+            conn.execute(text(f"DROP TABLE IF EXISTS {relation}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--zooms", type=int, nargs="+", default=[2, 5, 8, 12])
+    parser.add_argument("--tiles", type=int, default=20, help="tiles per zoom")
+    parser.add_argument("--geometry", choices=GEOMETRIES, default="point")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        parser.error("needs PostGIS; point SQLALCHEMY_DATABASE_URI at it")
+
+    with engine.begin() as conn:
+        conn.execute(text(LEGACY_FUNCTION))
+    try:
+        print(f"{args.geometry}s, median of {args.tiles} random tiles per zoom")
+        for size in args.sizes:
+            run(size, args.zooms, args.tiles, args.geometry)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "DROP FUNCTION IF EXISTS "
+                    "bench_legacy_dataset_tile(text, text, integer, integer, integer)"
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
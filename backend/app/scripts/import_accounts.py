@@ -0,0 +1,232 @@
+"""Bulk import accounts from a CSV or NDJSON file.
+
+Each input row needs ``email``, ``full_name`` and ``password`` (optionally
+``account_type`` and ``disabled``). Every account gets a profile, a default
+organization and a default project, exactly like signup.
+
+Usage:
+    python -m app.scripts.import_accounts accounts.csv [--batch-size 1000] [--workers 8]
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import Connection, func, insert, select
+
+from app.accounts.models import Account, AccountCreate, AccountProfile
+from app.auth.services.security import get_password_hash
+from app.core.clock import utc_now
+from app.core.database import engine
+from app.core.ids import generate_public_id, uuid7
+from app.core.logging import get_logger, setup_logging
+from app.organizations.models import Organization
+from app.projects.models import Project
+
+setup_logging()
+logger = get_logger(__name__)
+
+
+def read_rows(path: str) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def read_accounts(rows: Iterable[dict]) -> Iterator[AccountCreate]:
+    for line_no, row in enumerate(rows, start=1):
+        try:
+            yield AccountCreate(**{k: v for k, v in row.items() if v not in ("", None)})
+        except ValidationError as e:
+            logger.warning("Skipping row %d: %s", line_no, e.errors()[0]["msg"])
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def copy_rows(conn: Connection, table, rows: list[dict]) -> None:
+    """Write leaf rows with COPY through psycopg2, executemany elsewhere."""
+    if not rows:
+        return
+    if conn.dialect.driver != "psycopg2":
+        conn.execute(insert(table), rows)
+        return
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[c] for c in columns])
+    buffer.seek(0)
+    cursor = conn.connection.cursor()
+    cursor.copy_expert(
+        f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+        buffer,
+    )
+
+
+def insert_batch(
+    conn: Connection, accounts: list[AccountCreate], hashes: list[str]
+) -> int:
+    now = utc_now()
+    account_table = Account.__table__
+
+    # Insert accounts, letting insertmanyvalues batch them with RETURNING
+    account_rows = [
+        {
+            "email": a.email.lower(),
+            "hashed_password": h,
+            "disabled": a.disabled,
+            "account_type": a.account_type,
+            "uid": a.uid or uuid7(),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for a, h in zip(accounts, hashes)
+    ]
+    inserted = conn.execute(
+        insert(account_table).returning(account_table.c.id, account_table.c.email),
+        account_rows,
+    ).all()
+    account_ids = {email: account_id for account_id, email in inserted}
+
+    copy_rows(
+        conn,
+        AccountProfile.__table__,
+        [
+            {
+                "full_name": a.full_name,
+                "uid": uuid7(),
+                "account_id": account_ids[a.email.lower()],
+                "created_at": now,
+                "updated_at": now,
+            }
+            for a in accounts
+        ],
+    )
+
+    organization_table = Organization.__table__
+    organization_ids = conn.execute(
+        insert(organization_table).returning(organization_table.c.id),
+        [
+            {
+                "public_id": generate_public_id(prefix="org"),
+                "name": "Default org",
+                "description": "Default organization",
+                "is_default_org": True,
+                "uid": uuid7(),
+                "account_id": account_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for account_id in account_ids.values()
+        ],
+    ).scalars()
+
+    copy_rows(
+        conn,
+        Project.__table__,
+        [
+            {
+                "public_id": generate_public_id(prefix="project"),
+                "name": "Default project",
+                "description": "Default project",
+                "is_default_project": True,
+                "uid": uuid7(),
+                "organization_id": organization_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for organization_id in organization_ids
+        ],
+    )
+    return len(inserted)
+
+
+def filter_new_accounts(
+    conn: Connection, accounts: list[AccountCreate], seen: set[str]
+) -> list[AccountCreate]:
+    """Drop emails that already exist in the database or earlier in the file."""
+    emails = {a.email.lower() for a in accounts}
+    existing = set(
+        conn.execute(
+            select(Account.email).where(func.lower(Account.email).in_(emails))
+        ).scalars()
+    )
+    new_accounts = []
+    for account in accounts:
+        email = account.email.lower()
+        if email in existing or email in seen:
+            continue
+        seen.add(email)
+        new_accounts.append(account)
+    return new_accounts
+
+
+def import_accounts(path: str, batch_size: int, workers: int | None) -> None:
+    started = time.perf_counter()
+    imported = skipped = 0
+    seen: set[str] = set()
+
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in batched(read_accounts(read_rows(path)), batch_size):
+            batch_started = time.perf_counter()
+            with engine.connect() as conn:
+                accounts = filter_new_accounts(conn, batch, seen)
+            skipped += len(batch) - len(accounts)
+            if not accounts:
+                continue
+
+            # bcrypt dominates: spread it over every core, with no connection held
+            hashes = list(
+                pool.map(
+                    get_password_hash,
+                    [a.password for a in accounts],
+                    chunksize=max(1, len(accounts) // (workers * 4)),
+                )
+            )
+            with engine.begin() as conn:
+                imported += insert_batch(conn, accounts, hashes)
+
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "Imported %d accounts, skipped %d (batch %.1f/s, overall %.1f/s)",
+                imported,
+                skipped,
+                len(accounts) / (time.perf_counter() - batch_started),
+                imported / elapsed,
+            )
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Done: %d imported, %d skipped in %.1fs (%.1f accounts/s)",
+        imported,
+        skipped,
+        elapsed,
+        imported / elapsed if elapsed else 0.0,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="CSV file, or NDJSON when ending in .ndjson/.jsonl")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    import_accounts(args.path, batch_size=args.batch_size, workers=args.workers)
@@ -0,0 +1,258 @@
+"""Audit indexes and query plans of the service layer on Postgres.
+
+Runs the account services against a seeded database, records every statement
+they send and runs EXPLAIN on it with the same parameters. Sequential scans,
+duplicate indexes and indexes that no audited plan uses are reported. Plans
+are reduced to their shape (node types, relations and indexes, no costs) and
+compared with the snapshots committed in app/scripts/query_plans/. A changed
+or missing snapshot exits non-zero; --update rewrites them.
+
+Usage:
+    python -m app.scripts.index_audit [--seed 10000] [--analyze] [--update]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from pathlib import Path
+
+from sqlalchemy import Connection, event, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.accounts.models import Account, AccountCreate, AccountProfile, AccountType
+from app.accounts.services import (
+    encode_account_cursor,
+    get_account,
+    get_account_by_email,
+    get_account_profile,
+    get_account_profile_etag,
+    get_accounts,
+)
+from app.core.database import async_engine
+from app.core.logging import get_logger, setup_logging
+from app.organizations.models import Organization
+from app.projects.models import Project
+from app.scripts.import_accounts import batched, insert_batch
+
+setup_logging()
+logger = get_logger(__name__)
+
+SNAPSHOT_DIR = Path(__file__).parent / "query_plans"
+
+
+async def record_service_queries(db: AsyncSession, account: Account) -> dict:
+    """Run the account services for ``account`` and record what they send.
+
+    Returns {name: (statement, parameters)}. A service that sends several
+    statements has them recorded as name.1, name.2 and so on.
+    """
+    keyset = encode_account_cursor(account)
+    services = {
+        "get_account": lambda: get_account(db, account.id),
+        "get_account_by_email": lambda: get_account_by_email(db, account.email),
+        "get_account_profile": lambda: get_account_profile(db, account.id),
+        "get_account_profile_etag": lambda: get_account_profile_etag(db, account.id),
+        "get_accounts": lambda: get_accounts(db),
+        "get_accounts.filtered": lambda: get_accounts(
+            db, cursor=keyset, account_type=AccountType.USER, disabled=False
+        ),
+    }
+
+    sent = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sent.append((statement, tuple(parameters)))
+
+    queries = {}
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        for name, call in services.items():
+            sent.clear()
+            await call()
+            # Loaded rows would let the next service skip its statements
+            db.expunge_all()
+            if len(sent) == 1:
+                queries[name] = sent[0]
+            else:
+                for i, query in enumerate(sent, start=1):
+                    queries[f"{name}.{i}"] = query
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    return queries
+
+
+def seed(conn: Connection, count: int) -> None:
+    logger.info("Seeding %d accounts", count)
+    run_id = uuid.uuid4().hex[:8]
+    accounts = (
+        AccountCreate(
+            email=f"audit-{run_id}-{i}@example.com",
+            full_name=f"Audit {i}",
+            password="Audit12345",
+        )
+        for i in range(count)
+    )
+    for batch in batched(accounts, 1000):
+        insert_batch(conn, batch, ["audit"] * len(batch))
+
+
+def plan_shape(node: dict) -> dict:
+    shape = {"node": node["Node Type"]}
+    for key in ("Relation Name", "Index Name"):
+        if key in node:
+            shape[key.split()[0].lower()] = node[key]
+    if "Plans" in node:
+        shape["plans"] = [plan_shape(child) for child in node["Plans"]]
+    return shape
+
+
+def find_seq_scans(shape: dict) -> list[str]:
+    found = [shape["relation"]] if shape["node"] == "Seq Scan" else []
+    for child in shape.get("plans", []):
+        found += find_seq_scans(child)
+    return found
+
+
+def find_indexes(shape: dict) -> set[str]:
+    found = {shape["index"]} if "index" in shape else set()
+    for child in shape.get("plans", []):
+        found |= find_indexes(child)
+    return found
+
+
+async def explain(
+    conn: AsyncConnection, statement: str, parameters: tuple, analyze: bool
+) -> dict:
+    options = "ANALYZE, FORMAT JSON" if analyze else "FORMAT JSON"
+    plan = (
+        await conn.exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters)
+    ).scalar_one()
+    # asyncpg returns json as text
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+DUPLICATE_INDEXES = text(
+    """
+    SELECT indrelid::regclass AS table_name,
+           array_agg(indexrelid::regclass::text ORDER BY indexrelid) AS indexes
+    FROM pg_index
+    GROUP BY indrelid, indkey::text, coalesce(indexprs::text, ''),
+             coalesce(indpred::text, '')
+    HAVING count(*) > 1
+    """
+)
+
+# Unique and primary key indexes enforce constraints, so they are never unused
+SECONDARY_INDEXES = text(
+    """
+    SELECT c.relname AS table_name, ic.relname AS index_name
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indrelid
+    JOIN pg_class ic ON ic.oid = i.indexrelid
+    WHERE NOT i.indisunique AND NOT i.indisprimary AND c.relname = ANY(:tables)
+    """
+)
+
+
+async def audit(seed_count: int, analyze: bool, update: bool) -> int:
+    if async_engine.dialect.name != "postgresql":
+        logger.error(
+            "The index audit needs Postgres, got %s", async_engine.dialect.name
+        )
+        return 2
+
+    failures = 0
+    used_indexes = set()
+    if update:
+        SNAPSHOT_DIR.mkdir(exist_ok=True)
+
+    async with async_engine.connect() as conn:
+        if seed_count:
+            await conn.run_sync(seed, seed_count)
+        await conn.execute(text("ANALYZE"))
+
+        db = AsyncSession(bind=conn)
+        # The oldest account, so the filtered listing still has pages after it
+        account = (
+            await db.exec(
+                select(Account)
+                .join(AccountProfile)
+                .order_by(Account.created_at, Account.id)
+                .limit(1)
+            )
+        ).first()
+        if account is None:
+            logger.error("No account with a profile to audit with, use --seed")
+            return 2
+
+        queries = await record_service_queries(db, account)
+        for name, (statement, parameters) in queries.items():
+            plan = await explain(conn, statement, parameters, analyze)
+            shape = plan_shape(plan["Plan"])
+            used_indexes |= find_indexes(shape)
+            for relation in find_seq_scans(shape):
+                logger.warning("%s: sequential scan on %s", name, relation)
+
+            snapshot = SNAPSHOT_DIR / f"{name}.json"
+            if update:
+                snapshot.write_text(json.dumps(shape, indent=2) + "\n")
+            elif not snapshot.exists():
+                logger.error(
+                    "%s: no snapshot at %s, run with --update and commit it",
+                    name,
+                    snapshot,
+                )
+                failures += 1
+            elif json.loads(snapshot.read_text()) != shape:
+                logger.error(
+                    "%s: plan changed\n  expected: %s\n  actual:   %s",
+                    name,
+                    snapshot.read_text().strip(),
+                    json.dumps(shape),
+                )
+                failures += 1
+
+        if update:
+            for snapshot in SNAPSHOT_DIR.glob("*.json"):
+                if snapshot.stem not in queries:
+                    snapshot.unlink()
+
+        for table_name, indexes in await conn.execute(DUPLICATE_INDEXES):
+            logger.warning("%s: duplicate indexes %s", table_name, ", ".join(indexes))
+
+        tables = [
+            model.__tablename__
+            for model in (Account, AccountProfile, Organization, Project)
+        ]
+        for table_name, index_name in await conn.execute(
+            SECONDARY_INDEXES, {"tables": tables}
+        ):
+            if index_name not in used_indexes:
+                logger.warning(
+                    "%s: index %s is not used by any audited query",
+                    table_name,
+                    index_name,
+                )
+
+        # Leave the database as it was, seed included
+        await conn.rollback()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--seed", type=int, default=10_000, help="accounts to add first"
+    )
+    parser.add_argument("--analyze", action="store_true", help="use EXPLAIN ANALYZE")
+    parser.add_argument("--update", action="store_true", help="rewrite snapshots")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(audit(args.seed, args.analyze, args.update)))
@@ -10,35 +10,80 @@ CREATE OR REPLACE FUNCTION public.get_dataset_tile(
     y integer
 ) RETURNS bytea
 LANGUAGE plpgsql
+STABLE PARALLEL SAFE
 AS $$
 DECLARE
+    rel regclass := to_regclass(quote_ident(relation));
+    max_zoom integer;
+    properties text;
     tile bytea;
 BEGIN
-    EXECUTE format(
-        $f$
-        WITH mvtgeom AS (
-            SELECT ST_AsMVTGeom(
-                       ST_Transform(geom, 3857),
-                       ST_TileEnvelope(%s, %s, %s),
-                       4096,
-                       0,
-                       true
-                   ) AS geom
-			,%s AS id
-			,*
-            FROM %s
-            WHERE ST_Intersects(
-                ST_Transform(geom, 3857),
-                ST_TileEnvelope(%s, %s, %s)
+    IF rel IS NULL THEN
+        RAISE EXCEPTION 'relation "%" does not exist', relation
+            USING ERRCODE = 'undefined_table';
+    END IF;
+
+    -- Low zooms read the simplified level built by app.tiles.ingest, if any
+    FOREACH max_zoom IN ARRAY ARRAY[2, 4, 6] LOOP
+        IF z <= max_zoom THEN
+            rel := coalesce(
+                to_regclass(quote_ident(relation || '__z' || max_zoom)), rel
+            );
+            EXIT;
+        END IF;
+    END LOOP;
+
+    -- Every non-geometry column becomes a property; the feature id is "id"
+    SELECT coalesce(string_agg(format(', t.%I', attname), '' ORDER BY attnum), '')
+    INTO properties
+    FROM pg_attribute
+    WHERE attrelid = rel
+      AND attnum > 0
+      AND NOT attisdropped
+      AND attname <> 'id'
+      AND atttypid <> 'geometry'::regtype;
+
+    IF EXISTS (
+        SELECT 1 FROM pg_attribute
+        WHERE attrelid = rel AND attname = 'geom_3857' AND NOT attisdropped
+    ) THEN
+        -- Prepared by app.tiles.ingest: GIST-indexed, stored in EPSG:3857
+        EXECUTE format(
+            $f$
+            WITH mvtgeom AS (
+                SELECT ST_AsMVTGeom(
+                           t.geom_3857, ST_TileEnvelope($1, $2, $3), 4096, 0, true
+                       ) AS geom
+                      ,t.%I AS id%s
+                FROM %s t
+                WHERE t.geom_3857 && ST_TileEnvelope($1, $2, $3)
+            )
+            SELECT ST_AsMVT(mvtgeom, 'dataset', 4096, 'geom', 'id') FROM mvtgeom
+            $f$,
+            primary_key_column, properties, rel
+        ) INTO tile USING z, x, y;
+    ELSE
+        -- Not prepared yet: filter in EPSG:4326 so an index on geom still
+        -- applies, then reproject the candidates
+        EXECUTE format(
+            $f$
+            WITH mvtgeom AS (
+                SELECT ST_AsMVTGeom(
+                           ST_Transform(t.geom, 3857),
+                           ST_TileEnvelope($1, $2, $3),
+                           4096,
+                           0,
+                           true
+                       ) AS geom
+                      ,t.%I AS id%s
+                FROM %s t
+                WHERE t.geom && ST_Transform(ST_TileEnvelope($1, $2, $3), 4326)
             )
-        )
-        SELECT ST_AsMVT(mvtgeom, 'dataset', 4096, 'geom', 'id') FROM mvtgeom
-        $f$,
-        z, x, y,
-		primary_key_column,
-        quote_ident(relation),  -- Properly quote table name
-        z, x, y
-    ) INTO tile;
+            SELECT ST_AsMVT(mvtgeom, 'dataset', 4096, 'geom', 'id') FROM mvtgeom
+            $f$,
+            primary_key_column, properties, rel
+        ) INTO tile USING z, x, y;
+    END IF;
 
     IF tile IS NULL OR length(tile) = 0 THEN
         RETURN NULL;
@@ -13,6 +13,7 @@ from app.apps.services import create_app
 from app.auth.models import AccountType
 from app.auth.services.account import create_api_key
 from app.core.config import demo_settings, postgis_settings
+from app.core.database import async_session_factory
 from app.core.logging import get_logger, setup_logging
 from app.database.session import engine
 from app.files.services import handle_upload_minio
@@ -27,6 +28,8 @@ from app.geospatial_mapping.services import (
     get_dataset_bbox,
     update_dataset,
 )
+from app.tiles.ingest import prepare_dataset_table
+from app.tiles.services import register_dataset
 from app.users.models import UserProfile
 from app.users.schemas import AccountCreate, UserProfileCreate
 from app.users.services import (
@@ -219,6 +222,20 @@ async def load_geospatial_mapping_data(session: Session) -> None:
         pk_columns = pk_info.get("constrained_columns", [])
         primary_key_column = pk_columns[0]
 
+        # stored EPSG:3857 geometry, GIST index and clustering for tiles
+        prepare_dataset_table(engine, pg_table)
+
+        # serve tiles from the new table; drops tiles cached from a previous load
+        async with async_session_factory() as tiles_db:
+            version = await register_dataset(
+                tiles_db,
+                uuid.UUID(str(d.uid)),
+                pg_table,
+                primary_key_column,
+                account_id=d.account_id,
+            )
+        logger.info(f"Dataset {d.uid} serves tiles at version {version}")
+
         bbox = get_dataset_bbox(db=session, dataset_uid=d.uid)
 
         # update Dataset record status,bbox
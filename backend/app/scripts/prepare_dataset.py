@@ -0,0 +1,70 @@
+"""Prepare a loaded dataset table for tiles and bump its tile cache version.
+
+Usage:
+    python -m app.scripts.prepare_dataset <dataset_uid> [--relation u_...]
+        [--primary-key id] [--account-id 1]
+"""
+
+import argparse
+import asyncio
+import uuid
+from typing import Optional
+
+from app.core.database import async_engine, async_session_factory, engine
+from app.core.logging import get_logger, setup_logging
+from app.tiles.ingest import (
+    dataset_table_name,
+    get_primary_key_column,
+    prepare_dataset_table,
+)
+from app.tiles.services import register_dataset
+
+setup_logging()
+logger = get_logger(__name__)
+
+
+async def register(
+    dataset_uid: uuid.UUID,
+    relation: str,
+    primary_key: str,
+    account_id: Optional[int],
+) -> int:
+    try:
+        async with async_session_factory() as db:
+            return await register_dataset(
+                db, dataset_uid, relation, primary_key, account_id=account_id
+            )
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("dataset_uid", type=uuid.UUID)
+    parser.add_argument("--relation", help="default: u_<dataset_uid>")
+    parser.add_argument("--primary-key", help="default: the table's primary key")
+    parser.add_argument(
+        "--account-id",
+        type=int,
+        help="owning account; tiles are served to it only (default: unchanged)",
+    )
+    args = parser.parse_args()
+
+    relation = args.relation or dataset_table_name(args.dataset_uid)
+    with engine.connect() as conn:
+        primary_key = args.primary_key or get_primary_key_column(conn, relation)
+    prepare_dataset_table(engine, relation)
+
+    version = asyncio.run(
+        register(args.dataset_uid, relation, primary_key, args.account_id)
+    )
+    logger.info(
+        "Dataset %s serves tiles from %s, version %d",
+        args.dataset_uid,
+        relation,
+        version,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Prepare ingested dataset tables for tile serving (PostGIS only).
+
+Run after a dataset is loaded into its ``u_*`` table (e.g. by ogr2ogr),
+then register the table so cached tiles of the previous load are dropped.
+Every stage commits on its own, so tiles keep rendering from the live
+tables while the next ones are built.
+"""
+
+import uuid
+
+from sqlalchemy import Connection, Engine, inspect, text
+
+from app.core.logging import get_logger, setup_logging
+
+setup_logging()
+logger = get_logger(__name__)
+
+# Highest zoom served by each pyramid level; keep in sync with get_dataset_tile
+PYRAMID_MAX_ZOOMS = (2, 4, 6)
+TILE_PIXELS = 512
+WEB_MERCATOR_WIDTH = 40075016.68557849
+
+
+def dataset_table_name(dataset_uid: uuid.UUID | str) -> str:
+    return "u_" + str(dataset_uid).replace("-", "_")
+
+
+def get_primary_key_column(conn: Connection, relation: str) -> str:
+    columns = inspect(conn).get_pk_constraint(relation).get("constrained_columns")
+    return columns[0] if columns else "id"
+
+
+def add_web_mercator_geometry(engine: Engine, relation: str) -> None:
+    """Store geom in EPSG:3857 with a GIST index, in index order.
+
+    Tiles are cut in Web Mercator, so filtering on the stored column lets the
+    planner use the index instead of reprojecting every row, and clustering
+    puts the features of one tile on a few adjacent pages.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    table = quote(relation)
+    index = quote(f"{relation}_geom_3857_idx")
+
+    for statement in (
+        # Rewrites the table the first time only
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS geom_3857 geometry "
+        "GENERATED ALWAYS AS (ST_Transform(geom, 3857)) STORED",
+        f"CREATE INDEX IF NOT EXISTS {index} ON {table} USING GIST (geom_3857)",
+        f"CLUSTER {table} USING {index}",
+        f"ANALYZE {table}",
+    ):
+        with engine.begin() as conn:
+            conn.execute(text(statement))
+    logger.info("Prepared %s for tiles: geom_3857, GIST index, clustered", relation)
+
+
+def pyramid_table_name(relation: str, max_zoom: int) -> str:
+    return f"{relation}__z{max_zoom}"
+
+
+def pixel_size(zoom: int) -> float:
+    """Width in EPSG:3857 metres of one tile pixel at ``zoom``."""
+    return WEB_MERCATOR_WIDTH / (TILE_PIXELS * 2**zoom)
+
+
+def build_zoom_pyramid(engine: Engine, relation: str) -> None:
+    """Precompute geometry simplified to the pixel size of each low zoom band.
+
+    Low-zoom tiles cover most of the dataset, so rendering them from full
+    resolution geometry is slow and produces huge tiles. Each level keeps the
+    attribute columns of ``relation`` with geom_3857 simplified for the
+    highest zoom it serves; lines and polygons smaller than a pixel are
+    dropped and points are thinned to one per pixel. Levels are snapshots:
+    rebuild them whenever the dataset is reloaded.
+
+    A level is built under a temporary name, reading ``relation`` without
+    blocking it, then swapped in by a short rename.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.connect() as conn:
+        columns = [
+            column["name"]
+            for column in inspect(conn).get_columns(relation)
+            if column["name"] != "geom"
+        ]
+    targets = ", ".join(quote(column) for column in columns)
+    source = quote(relation)
+
+    for max_zoom in PYRAMID_MAX_ZOOMS:
+        level = pyramid_table_name(relation, max_zoom)
+        building = f"{level}__new"
+        table = quote(building)
+        tolerance = pixel_size(max_zoom)
+        values = ", ".join(
+            "ST_SimplifyPreserveTopology(geom_3857, :tolerance)"
+            if column == "geom_3857"
+            else quote(column)
+            for column in columns
+        )
+
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+            conn.execute(text(f"CREATE TABLE {table} (LIKE {source})"))
+            conn.execute(text(f"ALTER TABLE {table} DROP COLUMN geom"))
+            conn.execute(
+                text(
+                    f"INSERT INTO {table} ({targets}) SELECT {values} FROM {source} "
+                    "WHERE ST_Dimension(geom_3857) > 0 AND greatest("
+                    "ST_XMax(geom_3857) - ST_XMin(geom_3857), "
+                    "ST_YMax(geom_3857) - ST_YMin(geom_3857)) >= :tolerance"
+                ),
+                {"tolerance": tolerance},
+            )
+            conn.execute(
+                text(
+                    f"INSERT INTO {table} ({targets}) "
+                    "SELECT DISTINCT ON (ST_SnapToGrid(geom_3857, :tolerance)) "
+                    f"{targets} FROM {source} WHERE ST_Dimension(geom_3857) = 0"
+                ),
+                {"tolerance": tolerance},
+            )
+            index = quote(f"{building}_geom_3857_idx")
+            conn.execute(
+                text(f"CREATE INDEX {index} ON {table} USING GIST (geom_3857)")
+            )
+            conn.execute(text(f"CLUSTER {table} USING {index}"))
+
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {quote(level)}"))
+            conn.execute(text(f"ALTER TABLE {table} RENAME TO {quote(level)}"))
+            conn.execute(
+                text(
+                    f"ALTER INDEX {index} "
+                    f"RENAME TO {quote(f'{level}_geom_3857_idx')}"
+                )
+            )
+
+        with engine.begin() as conn:
+            conn.execute(text(f"ANALYZE {quote(level)}"))
+        logger.info("Built %s for zooms up to %d", level, max_zoom)
+
+
+def prepare_dataset_table(engine: Engine, relation: str) -> None:
+    add_web_mercator_geometry(engine, relation)
+    build_zoom_pyramid(engine, relation)
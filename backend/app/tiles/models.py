@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import TIMESTAMP, Column, Field, SQLModel
+
+from app.core.clock import utc_now
+
+
+class DatasetVersion(SQLModel, table=True):
+    """Where a dataset's features live, and the version its tiles are cached under.
+
+    Ingestion registers the table and bumps ``version`` whenever the data
+    changes; cached tiles of older versions are never served again. Tiles are
+    served to the owning account only, or to admins when there is no owner.
+    """
+
+    __tablename__ = "dataset_version"
+
+    dataset_uid: uuid.UUID = Field(primary_key=True)
+    relation: str
+    primary_key_column: str = "id"
+    version: int = 1
+    account_id: Optional[int] = Field(
+        default=None, foreign_key="account.id", index=True
+    )
+    updated_at: datetime = Field(
+        default_factory=utc_now,
+        sa_column=Column(TIMESTAMP, onupdate=utc_now),
+    )
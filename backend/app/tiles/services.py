@@ -0,0 +1,237 @@
+"""Vector tiles from PostGIS behind a memory and a disk cache.
+
+Tiles are cached under (dataset, version, z, x, y): first in a per-worker
+LRU, then as files under TILE_CACHE_DIR (inside CACHE_DIR) shared by the
+workers of a host. Misses render through get_dataset_tile(), with concurrent
+requests for the same tile sharing one query. Bumping a dataset's version
+makes every tile of the older version unreachable; workers notice within
+TILE_DATASET_CACHE_TTL_SECONDS.
+"""
+
+import asyncio
+import mmap
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from sqlalchemy import text, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import LRUCache, SingleFlight
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.core.exceptions import DatasetNotFoundException
+from app.core.logging import get_logger, setup_logging
+from app.core.responses import make_etag
+from app.tiles.models import DatasetVersion
+
+setup_logging()
+logger = get_logger(__name__)
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+class TileSource(NamedTuple):
+    dataset_uid: uuid.UUID
+    relation: str
+    primary_key_column: str
+    version: int
+    account_id: Optional[int]
+
+
+class TileStats:
+    def __init__(self):
+        self.disk_hits = 0
+        self.renders = 0
+        self.render_seconds_total = 0.0
+        self.render_seconds_max = 0.0
+
+    def record_render(self, seconds: float) -> None:
+        self.renders += 1
+        self.render_seconds_total += seconds
+        self.render_seconds_max = max(self.render_seconds_max, seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "disk_hits": self.disk_hits,
+            "renders": self.renders,
+            "avg_render_ms": (
+                self.render_seconds_total / self.renders * 1000 if self.renders else 0.0
+            ),
+            "max_render_ms": self.render_seconds_max * 1000,
+        }
+
+
+tile_source_cache = LRUCache(
+    maxsize=1024, ttl=settings.TILE_DATASET_CACHE_TTL_SECONDS
+)
+tile_cache = LRUCache(maxsize=settings.TILE_MEMORY_CACHE_MAXSIZE)
+tile_renders = SingleFlight()
+tile_stats = TileStats()
+
+
+# ******** Dataset versions ***************************************************
+async def get_tile_source(db: AsyncSession, dataset_uid: uuid.UUID) -> TileSource:
+    source = tile_source_cache.get(dataset_uid)
+    if source is None:
+        dataset = (
+            await db.exec(
+                select(DatasetVersion).where(DatasetVersion.dataset_uid == dataset_uid)
+            )
+        ).first()
+        if dataset is None:
+            raise DatasetNotFoundException
+        source = TileSource(
+            dataset_uid=dataset.dataset_uid,
+            relation=dataset.relation,
+            primary_key_column=dataset.primary_key_column,
+            version=dataset.version,
+            account_id=dataset.account_id,
+        )
+        tile_source_cache.set(dataset_uid, source)
+    return source
+
+
+async def bump_dataset_version(
+    db: AsyncSession, dataset_uid: uuid.UUID, **values
+) -> int:
+    """Invalidate every cached tile of a dataset; returns the new version.
+
+    ``values`` may also update ``relation``, ``primary_key_column`` or
+    ``account_id``.
+    """
+    version = (
+        await db.exec(
+            update(DatasetVersion)
+            .where(DatasetVersion.dataset_uid == dataset_uid)
+            .values(version=DatasetVersion.version + 1, **values)
+            .returning(DatasetVersion.version)
+        )
+    ).scalar_one_or_none()
+    if version is None:
+        raise DatasetNotFoundException
+    await db.commit()
+    tile_source_cache.pop(dataset_uid)
+    await asyncio.to_thread(prune_tile_files, dataset_uid, version)
+    return version
+
+
+async def register_dataset(
+    db: AsyncSession,
+    dataset_uid: uuid.UUID,
+    relation: str,
+    primary_key_column: str = "id",
+    account_id: Optional[int] = None,
+) -> int:
+    """Point a dataset at its table after (re)ingestion; returns its version.
+
+    ``account_id`` sets the owning account; when omitted, a registered dataset
+    keeps its owner.
+    """
+    values = {"relation": relation, "primary_key_column": primary_key_column}
+    if account_id is not None:
+        values["account_id"] = account_id
+    try:
+        return await bump_dataset_version(db, dataset_uid, **values)
+    except DatasetNotFoundException:
+        pass
+    db.add(DatasetVersion(dataset_uid=dataset_uid, **values))
+    await db.commit()
+    return 1
+
+
+# ******** Disk cache *********************************************************
+def tile_path(source: TileSource, z: int, x: int, y: int) -> Path:
+    return (
+        settings.tile_cache_path
+        / str(source.dataset_uid)
+        / str(source.version)
+        / str(z)
+        / str(x)
+        / f"{y}.mvt"
+    )
+
+
+def read_tile_file(path: Path) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""  # rendered, no features
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                return m[:]
+    except FileNotFoundError:
+        return None
+
+
+def write_tile_file(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Readers in other workers see either no file or the whole tile
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def prune_tile_files(dataset_uid: uuid.UUID, keep_version: int) -> None:
+    root = settings.tile_cache_path / str(dataset_uid)
+    if not root.is_dir():
+        return
+    for child in root.iterdir():
+        if child.name != str(keep_version):
+            shutil.rmtree(child, ignore_errors=True)
+
+
+# ******** Tiles **************************************************************
+def get_tile_etag(source: TileSource, z: int, x: int, y: int) -> str:
+    return make_etag(source.dataset_uid, source.version, z, x, y)
+
+
+async def render_tile(source: TileSource, z: int, x: int, y: int) -> bytes:
+    async with async_session_factory() as session:
+        data = (
+            await session.execute(
+                text("SELECT get_dataset_tile(:relation, :primary_key, :z, :x, :y)"),
+                {
+                    "relation": source.relation,
+                    "primary_key": source.primary_key_column,
+                    "z": z,
+                    "x": x,
+                    "y": y,
+                },
+            )
+        ).scalar_one()
+    return bytes(data) if data else b""
+
+
+async def _load_tile(source: TileSource, z: int, x: int, y: int) -> bytes:
+    path = tile_path(source, z, x, y)
+    data = await asyncio.to_thread(read_tile_file, path)
+    if data is not None:
+        tile_stats.disk_hits += 1
+    else:
+        started = time.perf_counter()
+        data = await render_tile(source, z, x, y)
+        tile_stats.record_render(time.perf_counter() - started)
+        await asyncio.to_thread(write_tile_file, path, data)
+    tile_cache.set((source, z, x, y), data)
+    return data
+
+
+async def get_tile_data(
+    db: AsyncSession, source: TileSource, z: int, x: int, y: int
+) -> bytes:
+    """MVT bytes of a tile, empty when it has no features.
+
+    Renders run on their own session; ``db`` is closed on a memory miss.
+    """
+    data = tile_cache.get((source, z, x, y))
+    if data is None:
+        # Give the caller's connection back before a render checks out its own
+        await db.close()
+        data = await tile_renders.do(
+            (source, z, x, y), lambda: _load_tile(source, z, x, y)
+        )
+    return data
@@ -1,67 +1,32 @@
-import json
 import re
-import secrets
-import string
 from email.message import EmailMessage
-
-import aiosmtplib
+from typing import Optional
 
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
 from app.core.config import mail_settings, settings
 from app.core.logging import get_logger, setup_logging
+from app.core.mail import get_smtp_pool
 
 setup_logging()
 logger = get_logger(__name__)
 
 
-def stream_json(records):
-    yield "["
-    first = True
-    for row in records:
-        if not first:
-            yield ","
-        else:
-            first = False
-        yield json.dumps(dict(row))
-    yield "]"
-
-
-def generate_public_id(prefix="org", random_length=16):
-    alphabet = string.ascii_letters + string.digits
-    random_part = "".join(secrets.choice(alphabet) for _ in range(random_length))
-    return f"{prefix}-{random_part}"
-
-
-def run_alembic_migration(DB_SQLALCHEMY_URI: str):
-    from alembic.command import upgrade
-    from alembic.config import Config
-
-    alembic_config = Config("alembic.ini")
-    alembic_config.set_main_option("sqlalchemy.url", DB_SQLALCHEMY_URI)
-    upgrade(alembic_config, "head")
-
-    # Rerun setup_logging due to alembic logging is interfere with the app logging
-    setup_logging()
-
-
-async def send_email_smtp(subject: str, body: str, recipient: str):
+async def send_email_smtp(
+    subject: str, body: str, recipient: str, text: Optional[str] = None
+):
+    """Send an HTML email, as multipart/alternative when a text part is given."""
     message = EmailMessage()
     message["From"] = f"{settings.BRAND_NAME} <{mail_settings.MAIL_SMTP_USERNAME}>"
     message["To"] = recipient
     message["Subject"] = subject
+    if text is not None:
+        message.set_content(text)
     message.add_alternative(body, subtype="html")
 
     if mail_settings.MAIL_ENABLED:
-        logger.debug(f"Sending SMTP {mail_settings.MAIL_SMTP_USERNAME}")
-        await aiosmtplib.send(
-            message,
-            hostname=mail_settings.MAIL_SMTP_HOST,
-            port=mail_settings.MAIL_SMTP_PORT,
-            start_tls=True,
-            username=mail_settings.MAIL_SMTP_USERNAME,
-            password=mail_settings.MAIL_SMTP_PASSWORD,
-        )
+        logger.debug("Sending SMTP %s", mail_settings.MAIL_SMTP_USERNAME)
+        await get_smtp_pool().send_message(message)
     else:
         print(
             f"""
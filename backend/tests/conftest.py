@@ -0,0 +1,95 @@
+"""Tests run against SQLALCHEMY_DATABASE_URI, a scratch SQLite file by default.
+
+Point it at an empty PostgreSQL database to exercise asyncpg and the query
+plan snapshots:
+
+    SQLALCHEMY_DATABASE_URI=postgresql://postgres@localhost/app_test pytest
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URI",
+    f"sqlite:///{os.path.join(tempfile.gettempdir(), 'saas-base-test.sqlite3')}",
+)
+os.environ.setdefault("MAIL_ENABLED", "false")
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+import app.main  # noqa: E402,F401 (registers every table)
+from app.accounts.models import AccountCreate  # noqa: E402
+from app.accounts.services import (  # noqa: E402
+    account_principal_cache,
+    account_profile_cache,
+    create_account,
+)
+from app.auth.services.jwt import create_access_token  # noqa: E402
+from app.core.database import async_engine, async_session_factory, engine  # noqa: E402
+
+
+class StatementCounter:
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+
+@pytest.fixture
+async def db():
+    SQLModel.metadata.create_all(engine)
+    try:
+        async with async_session_factory() as session:
+            yield session
+    finally:
+        await async_engine.dispose()
+        SQLModel.metadata.drop_all(engine)
+        account_principal_cache.clear()
+        account_profile_cache.clear()
+
+
+@pytest.fixture
+def statements():
+    """Statements sent through the async engine while the test runs."""
+    counter = StatementCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+
+@pytest.fixture
+def make_account(db):
+    async def make(email: str = "user@example.com"):
+        return await create_account(
+            db,
+            AccountCreate(email=email, full_name="Test User", password="Secret-pass-1"),
+        )
+
+    return make
+
+
+@pytest.fixture
+async def client(db):
+    """The app on the test's event loop, without its lifespan."""
+    transport = httpx.ASGITransport(app=app.main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+def auth_headers():
+    def headers(account) -> dict:
+        token = create_access_token({"sub": account.email, "id": account.id})
+        return {"Authorization": f"Bearer {token}"}
+
+    return headers
@@ -0,0 +1,124 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from app.accounts.models import Account
+from app.accounts.services import (
+    decode_account_cursor,
+    encode_account_cursor,
+    get_accounts,
+)
+from app.core.config import settings
+from app.core.exceptions import InvalidCursorException
+
+EARLIER = datetime(2025, 1, 1, 12, 0, 0, 123456)
+LATER = datetime(2025, 1, 2, 8, 30, 0, 500000)
+
+
+def b64(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+async def add_accounts(db, created_at: list[datetime]) -> list[Account]:
+    accounts = [
+        Account(email=f"user{i}@example.com", hashed_password=None, created_at=t)
+        for i, t in enumerate(created_at)
+    ]
+    db.add_all(accounts)
+    await db.commit()
+    return accounts
+
+
+def test_cursor_round_trip():
+    account = Account(id=42, email="user@example.com", created_at=EARLIER)
+    assert decode_account_cursor(encode_account_cursor(account)) == (EARLIER, 42)
+
+
+def test_cursor_with_offset_is_read_as_naive_utc():
+    cursor = b64('["2025-01-01T19:00:00.123456+07:00", 42]')
+    assert decode_account_cursor(cursor) == (EARLIER, 42)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        b64("not json"),
+        b64('{"created_at": 1}'),
+        b64("[1]"),
+        b64('["2025-01-01T12:00:00", 1, 2]'),
+        b64('["yesterday", 1]'),
+        b64('[null, 1]'),
+        b64('["2025-01-01T12:00:00", "x"]'),
+    ],
+)
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorException):
+        decode_account_cursor(cursor)
+
+
+async def test_pages_split_ties_on_created_at(db):
+    # Insert order differs from created_at order, and both timestamps are
+    # shared by several accounts, so pages end in the middle of a tie
+    accounts = await add_accounts(db, [LATER, EARLIER, LATER, EARLIER, LATER] * 2)
+    expected = [a.id for a in sorted(accounts, key=lambda a: (a.created_at, a.id))]
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = await get_accounts(db, limit=3, cursor=cursor)
+        seen.extend(item.id for item in page.items)
+        pages += 1
+        if page.next_cursor is None:
+            break
+        assert len(page.items) == 3
+        cursor = page.next_cursor
+
+    assert seen == expected
+    assert pages == 4
+
+
+async def test_last_full_page_has_no_cursor(db):
+    await add_accounts(db, [EARLIER] * 4)
+
+    first = await get_accounts(db, limit=2)
+    second = await get_accounts(db, limit=2, cursor=first.next_cursor)
+    assert len(second.items) == 2
+    assert second.next_cursor is None
+
+    assert (await get_accounts(db, limit=4)).next_cursor is None
+    assert (await get_accounts(db, limit=3)).next_cursor is not None
+
+
+async def test_cursor_applies_with_filters(db):
+    accounts = await add_accounts(db, [EARLIER] * 6)
+    for account in accounts[::2]:
+        account.disabled = True
+    await db.commit()
+    enabled = sorted(a.id for a in accounts if not a.disabled)
+
+    first = await get_accounts(db, limit=2, disabled=False)
+    rest = await get_accounts(db, limit=2, cursor=first.next_cursor, disabled=False)
+
+    assert [i.id for i in first.items + rest.items] == enabled
+    assert rest.next_cursor is None
+
+
+async def test_listing_rejects_tampered_cursor(
+    db, make_account, client, auth_headers, monkeypatch
+):
+    admin = await make_account("admin@example.com")
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", ["admin@example.com"])
+    headers = auth_headers(admin)
+
+    response = await client.get("/api/v1/accounts?limit=1", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["next_cursor"] is None
+
+    cursor = b64(json.dumps(["2025-01-01T12:00:00", "1 OR 1=1"]))
+    response = await client.get(
+        "/api/v1/accounts", params={"cursor": cursor}, headers=headers
+    )
+    assert response.status_code == 400
+    assert "INVALID_CURSOR" in response.text
@@ -0,0 +1,155 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from app.accounts.models import Account, AccountCreate, AccountProfile, AccountUpdate
+from app.accounts.services import (
+    create_account,
+    get_account_profile,
+    get_account_profile_etag,
+    get_account_profile_json,
+    update_account,
+)
+from app.core.database import async_engine
+from app.core.exceptions import EmailAlreadyExistsException
+from app.organizations.models import Organization
+from app.projects.models import Project
+
+
+async def test_create_and_update_account_write_timestamps(db, make_account):
+    account = await make_account()
+
+    stored = (await db.exec(select(Account).where(Account.id == account.id))).one()
+    assert stored.created_at.tzinfo is None
+    profile = (
+        await db.exec(
+            select(AccountProfile).where(AccountProfile.account_id == account.id)
+        )
+    ).one()
+    assert profile.full_name == "Test User"
+    organization = (
+        await db.exec(
+            select(Organization).where(Organization.account_id == account.id)
+        )
+    ).one()
+    assert organization.is_default_org
+    project = (
+        await db.exec(
+            select(Project).where(Project.organization_id == organization.id)
+        )
+    ).one()
+    assert project.is_default_project
+
+    # onupdate fills updated_at through the async engine as well
+    updated = await update_account(
+        db, AccountUpdate(id=account.id, email="renamed@example.com")
+    )
+    assert updated.email == "renamed@example.com"
+    assert updated.updated_at >= stored.created_at
+
+
+async def test_create_account_rejects_duplicate_email(db, make_account):
+    account = await make_account("user@example.com")
+
+    with pytest.raises(EmailAlreadyExistsException):
+        await make_account("User@Example.com")
+
+    # Other unique violations are not reported as a taken email
+    with pytest.raises(IntegrityError):
+        await create_account(
+            db,
+            AccountCreate(
+                email="other@example.com",
+                full_name="Other User",
+                password="Secret-pass-1",
+                uid=account.uid,
+            ),
+        )
+
+
+async def test_profile_load_statement_count_is_constant(db, make_account, statements):
+    account = await make_account()
+
+    statements.reset()
+    profile = await get_account_profile(db, account.id)
+    assert len(profile.organizations) == 1
+    baseline = len(statements)
+
+    for i in range(3):
+        organization = Organization(
+            account_id=account.id, name=f"Org {i}", description=None
+        )
+        db.add(organization)
+        await db.flush()
+        for j in range(2):
+            db.add(
+                Project(
+                    organization_id=organization.id,
+                    name=f"Project {j}",
+                    description=None,
+                )
+            )
+    await db.commit()
+    db.expunge_all()
+
+    statements.reset()
+    profile = await get_account_profile(db, account.id)
+    assert len(profile.organizations) == 4
+    assert sum(len(o.projects) for o in profile.organizations) == 7
+    # account+profile, organizations, projects
+    assert len(statements) == baseline == 3
+
+
+async def test_profile_cache_miss_holds_one_connection(db, make_account):
+    account = await make_account()
+    # Leaves the request session holding a connection, as in the route
+    etag = await get_account_profile_etag(db, account.id)
+
+    checked_out = {"now": 1, "peak": 1}
+
+    def on_checkout(*args):
+        checked_out["now"] += 1
+        checked_out["peak"] = max(checked_out["peak"], checked_out["now"])
+
+    def on_checkin(*args):
+        checked_out["now"] -= 1
+
+    event.listen(async_engine.sync_engine, "checkout", on_checkout)
+    event.listen(async_engine.sync_engine, "checkin", on_checkin)
+    try:
+        body = await get_account_profile_json(db, account.id, etag)
+    finally:
+        event.remove(async_engine.sync_engine, "checkout", on_checkout)
+        event.remove(async_engine.sync_engine, "checkin", on_checkin)
+
+    assert account.email.encode() in body
+    # The request's connection went back before the load took its own
+    assert checked_out["peak"] == 1
+
+
+async def test_profile_etag_revalidates_and_changes_on_update(
+    db, make_account, client, auth_headers
+):
+    account = await make_account()
+    headers = auth_headers(account)
+
+    response = await client.get("/api/v1/accounts/profile/me", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert response.json()["email"] == account.email
+
+    response = await client.get(
+        "/api/v1/accounts/profile/me", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    await update_account(db, AccountUpdate(id=account.id, password="Other-pass-2"))
+
+    response = await client.get(
+        "/api/v1/accounts/profile/me", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,58 @@
+import hashlib
+import time
+from datetime import timedelta
+
+import pytest
+from jose import ExpiredSignatureError
+
+from app.accounts.models import Account
+from app.accounts.services import invalidate_account_principal
+from app.auth.services.jwt import create_access_token, token_cache, verify_access_token
+from app.core.exceptions import AccountDisabledException, InvalidAccessTokenException
+from app.dependencies import get_current_account_with_token, get_current_active_account
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+def cache_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def test_cached_token_expires_at_exp():
+    token = create_access_token(
+        {"sub": "user@example.com", "id": 1}, timedelta(seconds=1)
+    )
+    payload = verify_access_token(token)
+    assert token_cache.get(cache_key(token)) == payload
+
+    time.sleep(max(payload.exp - time.time(), 0) + 0.1)
+
+    assert token_cache.get(cache_key(token)) is None
+    # jose rejects it a second later than verify_access_token's own check
+    with pytest.raises((ExpiredSignatureError, InvalidAccessTokenException)):
+        verify_access_token(token)
+
+
+async def test_disabled_account_is_not_served_from_cache(db, make_account):
+    account = await make_account()
+    token = create_access_token({"sub": account.email, "id": account.id})
+    principal = await get_current_account_with_token(token, db)
+    assert await get_current_active_account(principal) == principal
+
+    stored = await db.get(Account, account.id)
+    stored.disabled = True
+    db.add(stored)
+    await db.commit()
+    invalidate_account_principal(account.id)
+
+    # The token is still cached, the principal behind it is reloaded
+    principal = await get_current_account_with_token(token, db)
+    assert token_cache.get(cache_key(token)) is not None
+    assert principal.disabled
+    with pytest.raises(AccountDisabledException):
+        await get_current_active_account(principal)
@@ -0,0 +1,139 @@
+import gzip
+import json
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.compression import ENCODINGS, CompressionMiddleware, negotiate_encoding
+
+BODY = json.dumps([{"id": i, "name": f"item {i}"} for i in range(200)]).encode()
+
+
+async def large(request):
+    return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+
+async def small(request):
+    return Response(b'{"ok": true}', media_type="application/json")
+
+
+async def tile(request):
+    return Response(BODY, media_type="application/vnd.mapbox-vector-tile")
+
+
+async def encoded(request):
+    return Response(
+        gzip.compress(BODY),
+        media_type="application/json",
+        headers={"Content-Encoding": "gzip"},
+    )
+
+
+async def stream(request):
+    async def chunks():
+        for i in range(0, len(BODY), 1000):
+            yield BODY[i : i + 1000]
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+@pytest.fixture
+def client():
+    app = Starlette(
+        routes=[
+            Route("/large", large),
+            Route("/small", small),
+            Route("/tile", tile),
+            Route("/encoded", encoded),
+            Route("/stream", stream),
+        ]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=1000)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("gzip, deflate", "gzip"),
+        ("*", ENCODINGS[0]),
+        ("gzip;q=1, br;q=0.5, zstd;q=0.1", "gzip"),
+        ("gzip;q=oops, br", "br" if "br" in ENCODINGS else None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_compresses_with_each_available_encoding(client, encoding):
+    response = client.get("/large", headers={"Accept-Encoding": encoding})
+
+    assert response.headers["content-encoding"] == encoding
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.headers["vary"] == "Accept-Encoding"
+    # The client decodes the body transparently
+    assert response.content == BODY
+
+
+def test_compressed_etag_is_weak(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["etag"] == 'W/"v1"'
+
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1"'
+
+
+@pytest.mark.parametrize("path", ["/small", "/tile"])
+def test_small_and_incompressible_bodies_pass_through(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_encoded_body_passes_through(client):
+    response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BODY
+
+
+def test_streaming_response_keeps_one_context(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == BODY
+
+
+async def test_start_is_sent_before_other_messages():
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.pathsend", "path": "/tmp/body.json"})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    await CompressionMiddleware(app)(scope, None, send)
+
+    assert [m["type"] for m in sent] == [
+        "http.response.start",
+        "http.response.pathsend",
+    ]
+    assert (b"content-encoding", b"gzip") not in sent[0]["headers"]
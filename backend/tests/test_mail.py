@@ -0,0 +1,116 @@
+import asyncio
+import socket
+from email.message import EmailMessage
+
+import aiosmtplib
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.core.mail import SMTPConnectionPool
+
+
+class Handler:
+    def __init__(self):
+        self.delivered: list[str] = []
+        self.drop_next_mail = False
+        self.data_delay = 0.0
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):
+        if self.drop_next_mail:
+            # Like a server closing an idle session under us
+            self.drop_next_mail = False
+            server.transport.close()
+            return "421 Closing"
+        envelope.mail_from = address
+        envelope.mail_options.extend(mail_options)
+        return "250 OK"
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("nobody@"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.delivered.extend(envelope.rcpt_tos)
+        await asyncio.sleep(self.data_delay)
+        return "250 Message accepted"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = Handler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield handler, controller
+    controller.stop()
+
+
+@pytest.fixture
+async def pool(smtp_server):
+    _, controller = smtp_server
+    pool = SMTPConnectionPool(
+        hostname=controller.hostname,
+        port=controller.port,
+        start_tls=False,
+        timeout=1,
+    )
+    yield pool
+    await pool.close()
+
+
+def make_message(recipient: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "noreply@example.com"
+    message["To"] = recipient
+    message["Subject"] = "Hello"
+    message.set_content("Hello")
+    return message
+
+
+async def test_messages_share_one_connection(smtp_server, pool):
+    handler, _ = smtp_server
+    for i in range(3):
+        await pool.send_message(make_message(f"user{i}@example.com"))
+    await pool.send_messages([make_message("batch@example.com")] * 2)
+
+    assert len(handler.delivered) == 5
+    assert pool.connects == 1
+
+
+async def test_refused_recipient_keeps_the_connection(smtp_server, pool):
+    handler, _ = smtp_server
+    await pool.send_message(make_message("first@example.com"))
+    with pytest.raises(aiosmtplib.SMTPRecipientsRefused):
+        await pool.send_message(make_message("nobody@example.com"))
+    await pool.send_message(make_message("second@example.com"))
+
+    assert handler.delivered == ["first@example.com", "second@example.com"]
+    assert pool.connects == 1
+
+
+async def test_dropped_connection_is_retried_before_data(smtp_server, pool):
+    handler, _ = smtp_server
+    await pool.send_message(make_message("first@example.com"))
+    handler.drop_next_mail = True
+    await pool.send_message(make_message("second@example.com"))
+
+    assert handler.delivered == ["first@example.com", "second@example.com"]
+    assert pool.reconnects == 1
+
+
+async def test_timeout_after_data_is_not_resent(smtp_server, pool):
+    handler, _ = smtp_server
+    handler.data_delay = 2
+    with pytest.raises(TimeoutError):
+        await pool.send_message(make_message("slow@example.com"))
+    await asyncio.sleep(1.5)
+
+    assert handler.delivered == ["slow@example.com"]
+    assert pool.reconnects == 0
@@ -0,0 +1,30 @@
+import asyncio
+
+from sqlmodel import select
+
+from app.outbox.models import EmailKind, EmailOutbox, OutboxStatus
+from app.outbox.services import enqueue_email
+from app.outbox.worker import process_batch
+
+
+async def test_worker_sends_and_clears_payloads(db, make_account):
+    account = await make_account()
+    enqueue_email(
+        db,
+        EmailKind.PASSWORD_RESET,
+        account.email,
+        account_id=account.id,
+        locale="en",
+    )
+    await db.commit()
+
+    queued = (await db.exec(select(EmailOutbox).order_by(EmailOutbox.id))).all()
+    assert [m.kind for m in queued] == ["welcome", "password_reset"]
+    assert queued[1].payload == {"account_id": account.id, "locale": "en"}
+
+    assert await process_batch(10, asyncio.Semaphore(2)) == 2
+
+    db.expire_all()
+    sent = (await db.exec(select(EmailOutbox))).all()
+    assert {m.status for m in sent} == {OutboxStatus.SENT}
+    assert all(m.payload == {} and m.sent_at.tzinfo is None for m in sent)
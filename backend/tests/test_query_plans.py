@@ -0,0 +1,28 @@
+"""Query plan snapshots of the account services.
+
+The plan regression test needs Postgres: it only runs when
+SQLALCHEMY_DATABASE_URI points at a Postgres database and is skipped on the
+default SQLite run. No CI job sets one, so run it by hand (see README.md)
+after changing a service query, a model index or a migration.
+"""
+
+import pytest
+
+from app.core.database import engine
+from app.scripts.index_audit import SNAPSHOT_DIR, audit, record_service_queries
+
+postgres_only = pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="plans are snapshotted on Postgres"
+)
+
+
+async def test_every_service_query_has_a_snapshot(db, make_account):
+    account = await make_account()
+    names = set(await record_service_queries(db, account))
+
+    assert names == {path.stem for path in SNAPSHOT_DIR.glob("*.json")}
+
+
+@postgres_only
+async def test_query_plans_match_snapshots(db):
+    assert await audit(seed_count=10_000, analyze=False, update=False) == 0
@@ -0,0 +1,84 @@
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from app.core.config import BACKEND_DIR, Settings, settings
+from app.tiles.services import (
+    get_tile_source,
+    register_dataset,
+    tile_cache,
+    tile_path,
+    tile_source_cache,
+    write_tile_file,
+)
+
+TILE = b"\x1a\x05layer"
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_DIR", str(tmp_path))
+    yield tmp_path
+    tile_cache.clear()
+    tile_source_cache.clear()
+
+
+async def add_cached_dataset(db, account_id: Optional[int]) -> uuid.UUID:
+    """A dataset whose tile 1/0/1 is on disk, so serving it needs no PostGIS."""
+    dataset_uid = uuid.uuid4()
+    await register_dataset(db, dataset_uid, "u_test", account_id=account_id)
+    source = await get_tile_source(db, dataset_uid)
+    write_tile_file(tile_path(source, 1, 0, 1), TILE)
+    return dataset_uid
+
+
+def tile_url(dataset_uid: uuid.UUID) -> str:
+    return f"/api/v1/tiles/{dataset_uid}/1/0/1.mvt"
+
+
+async def test_tiles_are_served_to_the_owner_only(
+    db, make_account, client, auth_headers
+):
+    owner = await make_account("owner@example.com")
+    other = await make_account("other@example.com")
+    dataset_uid = await add_cached_dataset(db, owner.id)
+
+    response = await client.get(tile_url(dataset_uid), headers=auth_headers(owner))
+    assert response.status_code == 200
+    assert response.content == TILE
+    etag = response.headers["ETag"]
+
+    # Neither the cached tile nor a 304 for someone else
+    for extra in ({}, {"If-None-Match": etag}):
+        response = await client.get(
+            tile_url(dataset_uid), headers={**auth_headers(other), **extra}
+        )
+        assert response.status_code == 404
+
+
+async def test_datasets_without_owner_are_served_to_admins_only(
+    db, make_account, client, auth_headers, monkeypatch
+):
+    admin = await make_account("admin@example.com")
+    user = await make_account("user@example.com")
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", ["admin@example.com"])
+    dataset_uid = await add_cached_dataset(db, None)
+
+    response = await client.get(tile_url(dataset_uid), headers=auth_headers(user))
+    assert response.status_code == 404
+
+    response = await client.get(tile_url(dataset_uid), headers=auth_headers(admin))
+    assert response.status_code == 200
+    assert response.content == TILE
+
+
+def test_tile_cache_path_does_not_depend_on_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    assert Settings().tile_cache_path == BACKEND_DIR / ".cache" / "tiles"
+    assert Settings(CACHE_DIR="/var/cache/app").tile_cache_path == Path(
+        "/var/cache/app/tiles"
+    )
+    assert Settings(TILE_CACHE_DIR="/srv/tiles").tile_cache_path == Path("/srv/tiles")